@@ -0,0 +1,216 @@
+"""
+Async-Varianten der lesenden Endpunkte für den Betrieb unter ASGI.
+
+DRF-Views sind synchron und belegen unter ASGI pro Request einen Thread.
+Diese Views laufen direkt im Event-Loop und verwenden das async ORM; sie
+nutzen Queryset-Aufbau, Filter, Berechtigungen und Serializer der
+entsprechenden ViewSets, sodass die Antworten identisch sind.
+
+Einschränkungen: Authentifizierung nur per Token, kein Response-Cache (ETag)
+wie bei OfferViewSet. Das async ORM führt Abfragen weiterhin über
+sync_to_async in einem Thread pro Request aus; asyncio.gather bringt daher
+vor allem unter PostgreSQL und bei mehreren Requests Vorteile, unter SQLite
+werden Abfragen serialisiert.
+"""
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import APIException, AuthenticationFailed, Throttled
+from rest_framework.request import Request
+
+from ..caching import has_atomic_incr
+from ..db_router import use_primary
+from ..stats import aget_order_counts, get_base_info
+from .authentication import token_user_cache
+from .renderers import FastJSONRenderer
+from .throttling import ReadWriteRateThrottle
+from .views import OfferViewSet, ReviewsViewSet
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(FastJSONRenderer().render(data),
+                        content_type='application/json', status=status_code)
+
+
+def _exception_response(exc):
+    data = exc.detail if isinstance(
+        exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = _json_response(data, exc.status_code)
+    if isinstance(exc, AuthenticationFailed):
+        response['WWW-Authenticate'] = 'Token'
+    if getattr(exc, 'wait', None):
+        response['Retry-After'] = '%d' % exc.wait
+    return response
+
+
+async def _authenticate(request):
+    """
+    Async-Gegenstück zu CachedTokenAuthentication (gleicher Prozess-Cache).
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if not auth or auth[0].lower() != 'token':
+        return AnonymousUser()
+    if len(auth) != 2:
+        raise AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+
+    key = auth[1]
+    if has_atomic_incr():
+        credentials = token_user_cache.get(key)
+    else:
+        # Die Prüfung des Änderungsstempels liest aus Datei- oder Datenbankcache
+        credentials = await sync_to_async(token_user_cache.get)(key)
+    if credentials is None:
+        loaded_at = time.time()
+        with use_primary():
+            token = await Token.objects.select_related('user').filter(key=key).afirst()
+        if token is None:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        credentials = (token.user, token)
+        token_user_cache.set(key, credentials, loaded_at)
+    return credentials[0]
+
+
+def async_api_view(view):
+    """
+    Erlaubt nur GET, authentifiziert per Token, wendet das Lese-Limit an und
+    wandelt DRF-Exceptions in JSON-Antworten um.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _json_response({'detail': _('Method "%s" not allowed.') % request.method},
+                                  status.HTTP_405_METHOD_NOT_ALLOWED)
+        try:
+            user = await _authenticate(request)
+            request.user = user
+            throttle = ReadWriteRateThrottle()
+            if has_atomic_incr():
+                # Nur kurze Cache-Zugriffe, daher direkt im Event-Loop
+                allowed = throttle.allow_request(request, None)
+            else:
+                # Zähler liegen in der Datenbank (siehe throttling.increment_counter)
+                allowed = await sync_to_async(throttle.allow_request)(request, None)
+            if not allowed:
+                raise Throttled(throttle.wait())
+            return await view(request, user, *args, **kwargs)
+        except APIException as exc:
+            return _exception_response(exc)
+
+    return wrapper
+
+
+def _init_view(viewset_class, request, user, action, **kwargs):
+    drf_request = Request(request, authenticators=())
+    drf_request.user = user
+    view = viewset_class(request=drf_request, action=action, args=(),
+                         kwargs=kwargs, format_kwarg=None)
+    view.check_permissions(drf_request)
+    return drf_request, view
+
+
+async def _list(viewset_class, request, user):
+    drf_request, view = _init_view(viewset_class, request, user, 'list')
+    if view.delta_query_param in drf_request.query_params:
+        return _json_response(await view.alist_delta(drf_request))
+    queryset = view.filter_queryset(view.get_queryset())
+    projection = view.get_projection()
+    if projection is not None:
+        queryset = projection.get_queryset(queryset)
+
+    page = await view.paginator.apaginate_queryset(queryset, drf_request, view)
+    if projection is not None:
+        data = await projection.aserialize(queryset if page is None else page)
+    elif page is None:
+        rows = [row async for row in queryset]
+        data = view.get_serializer(rows, many=True).data
+    else:
+        data = view.get_serializer(page, many=True).data
+    if page is None:
+        return _json_response(data)
+    return _json_response(view.paginator.get_paginated_response(data).data)
+
+
+@async_api_view
+async def offer_list(request, user):
+    return await _list(OfferViewSet, request, user)
+
+
+@async_api_view
+async def offer_detail(request, user, pk):
+    if not user.is_authenticated:
+        return _json_response({'details': 'Benutzer ist nicht authentifiziert.'},
+                              status.HTTP_401_UNAUTHORIZED)
+
+    drf_request, view = _init_view(OfferViewSet, request, user, 'retrieve', pk=pk)
+    offer = await view.filter_queryset(view.get_queryset()).filter(pk=pk).afirst()
+    if offer is None:
+        return _json_response({'details': 'Das Angebot mit der angegebenen ID wurde nicht gefunden.'},
+                              status.HTTP_404_NOT_FOUND)
+    view.check_object_permissions(drf_request, offer)
+
+    offer_data = view.get_serializer(offer).data
+    if "user_details" in offer_data:
+        offer_data["user_details"] = {
+            "first_name": offer.user.first_name,
+            "last_name": offer.user.last_name,
+            "username": offer.user.username
+        }
+    return _json_response(offer_data)
+
+
+@async_api_view
+async def review_list(request, user):
+    return await _list(ReviewsViewSet, request, user)
+
+
+@async_api_view
+async def base_info(request, user):
+    # Cache-Treffer sind der Normalfall; ein Miss wartet ggf. per Polling auf
+    # einen anderen Worker und darf deshalb den Event-Loop nicht blockieren
+    return _json_response(await sync_to_async(get_base_info)())
+
+
+async def _order_counts_response(request, user, pk, build):
+    if not user.is_authenticated:
+        return _json_response({'detail': 'Benutzer ist nicht authentifiziert.'},
+                              status.HTTP_401_UNAUTHORIZED)
+    try:
+        order_counts = await aget_order_counts(pk)
+    except (ValueError, TypeError):
+        order_counts = None
+
+    if order_counts is None:
+        return _json_response({"error": "Kein Geschäftsnutzer mit der angegebenen ID gefunden"},
+                              status.HTTP_404_NOT_FOUND)
+    return _json_response(build(order_counts))
+
+
+@async_api_view
+async def order_count(request, user, pk):
+    return await _order_counts_response(request, user, pk, lambda counts: {
+        "order_count": counts['in_progress'],
+    })
+
+
+@async_api_view
+async def completed_order_count(request, user, pk):
+    return await _order_counts_response(request, user, pk, lambda counts: {
+        "completed_order_count": counts['completed'],
+    })
+
+
+@async_api_view
+async def order_stats(request, user, pk):
+    return await _order_counts_response(request, user, pk, lambda counts: {
+        "order_count": counts['in_progress'],
+        "completed_order_count": counts['completed'],
+        "cancelled_order_count": counts['cancelled'],
+    })
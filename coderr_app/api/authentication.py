@@ -0,0 +1,133 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+
+from ..db_router import use_primary
+
+
+class TokenUserCache:
+    """
+    Begrenzter LRU-Cache im Prozess (Token-Digest -> (User, Token)) mit
+    Ablaufzeit.
+
+    Ändern sich Nutzer oder Token, wird der Zeitpunkt pro Nutzer im
+    gemeinsamen Cache vermerkt. Andere Worker vergleichen ihn spätestens
+    nach recheck Sekunden mit dem Ladezeitpunkt ihres Eintrags und laden
+    ihn dann neu. Im gemeinsamen Cache liegen weder Token noch Nutzerdaten.
+    """
+
+    def __init__(self, maxsize, timeout, recheck):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.recheck = recheck
+        # digest -> [ablauf, zuletzt_geprüft, geladen_um, credentials]
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def _changed_key(user_id):
+        return f'auth-user-changed:{user_id}'
+
+    def get(self, key):
+        digest = self._digest(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, checked_at, loaded_at, credentials = entry
+            if expires_at < now:
+                self._remove(digest)
+                return None
+            self._entries.move_to_end(digest)
+            if now - checked_at < self.recheck:
+                return credentials
+
+        # Außerhalb des Locks, da der gemeinsame Cache ein Dateizugriff sein kann
+        changed_at = cache.get(self._changed_key(credentials[0].pk))
+        with self._lock:
+            if changed_at is not None and changed_at >= loaded_at:
+                self._remove(digest)
+                return None
+            if digest in self._entries:
+                self._entries[digest][1] = now
+        return credentials
+
+    def set(self, key, credentials, loaded_at):
+        """
+        loaded_at ist time.time() vor dem Laden aus der Datenbank.
+        """
+        digest = self._digest(key)
+        now = time.monotonic()
+        with self._lock:
+            self._remove(digest)
+            self._entries[digest] = [now + self.timeout, now, loaded_at, credentials]
+            self._keys_by_user.setdefault(credentials[0].pk, set()).add(digest)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        """
+        Verwirft die Einträge des Nutzers sofort in diesem Prozess und nach
+        dem Commit in allen Workern.
+        """
+        def publish():
+            self._remove_user(user_id)
+            # Nur so lange nötig, wie Einträge höchstens leben
+            cache.set(self._changed_key(user_id), time.time(), self.timeout)
+
+        self._remove_user(user_id)
+        transaction.on_commit(publish)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove_user(self, user_id):
+        with self._lock:
+            for digest in list(self._keys_by_user.get(user_id, ())):
+                self._remove(digest)
+
+    def _remove(self, digest):
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = entry[3][0].pk
+        digests = self._keys_by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._keys_by_user[user_id]
+
+
+token_user_cache = TokenUserCache(
+    settings.TOKEN_AUTH_CACHE_SIZE, settings.TOKEN_AUTH_CACHE_TIMEOUT,
+    settings.TOKEN_AUTH_RECHECK_SECONDS)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication, die aufgelöste Nutzer im Prozess zwischenspeichert.
+    """
+
+    def authenticate_credentials(self, key):
+        credentials = token_user_cache.get(key)
+        if credentials is None:
+            loaded_at = time.time()
+            # Frisch erzeugte Token sind auf Replikaten ggf. noch nicht sichtbar
+            with use_primary():
+                credentials = super().authenticate_credentials(key)
+            token_user_cache.set(key, credentials, loaded_at)
+        return credentials
@@ -0,0 +1,42 @@
+"""
+Sammelabruf mehrerer Objekte per ?ids=1,2,3 mit einer einzigen Abfrage.
+"""
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .filters import parse_id
+
+
+class BatchRetrieveMixin:
+    """
+    Stellt eine list-Aktion bereit, die die unter ?ids= angegebenen Objekte
+    als {id: daten} liefert. Es gelten dieselben Berechtigungen wie beim
+    Einzelabruf; nicht gefundene oder nicht sichtbare Objekte sind None.
+    """
+    batch_query_param = 'ids'
+    max_batch_size = 100
+
+    def get_batch_ids(self, request):
+        value = request.query_params.get(self.batch_query_param, '')
+        ids = [parse_id(part.strip()) for part in value.split(',') if part.strip()]
+        if not ids or None in ids:
+            raise ValidationError(
+                {'details': f'{self.batch_query_param} muss eine kommagetrennte Liste von IDs sein.'})
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {'details': f'Höchstens {self.max_batch_size} IDs pro Anfrage.'})
+        return ids
+
+    def has_object_permission(self, request, obj):
+        return all(permission.has_object_permission(request, self, obj)
+                   for permission in self.get_permissions())
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_batch_ids(request)
+        objects = [obj for obj in self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+                   if self.has_object_permission(request, obj)]
+        data = dict(zip((obj.pk for obj in objects),
+                        self.get_serializer(objects, many=True).data))
+        return Response({str(pk): data.get(pk) for pk in ids}, status=status.HTTP_200_OK)
@@ -0,0 +1,61 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..caching import get_namespace_version, get_or_compute, namespaced_key
+
+
+class CachedResponseMixin:
+    """
+    Cacht erfolgreiche GET-Antworten eines ViewSets pro Namensraum-Version und
+    beantwortet bedingte Requests (If-None-Match/If-Modified-Since) mit 304.
+
+    Der Cache-Schlüssel enthält nur die in cache_query_params aufgeführten
+    Parameter (sortiert), sodass gleichwertige URLs denselben Eintrag teilen.
+    Schreibzugriffe erhöhen die Version über bump_namespace_version; bei einem
+    Miss rendert nur ein Request pro Schlüssel (get_or_compute).
+    """
+    cache_namespace = None
+    cache_query_params = ()
+
+    def get_response_cache_key(self, request, version, kwargs):
+        params = sorted(
+            (name, request.query_params.get(name))
+            for name in self.cache_query_params if name in request.query_params
+        )
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field, '')
+        return namespaced_key(
+            self.cache_namespace, self.action, lookup,
+            f"{request.scheme}://{request.get_host()}?{urlencode(params)}", version=version)
+
+    def cached_response(self, request, render, *args, **kwargs):
+        version, last_modified = get_namespace_version(self.cache_namespace)
+        key = self.get_response_cache_key(request, version, kwargs)
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+        last_modified = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            rendered = []
+
+            def compute():
+                rendered.append(render(request, *args, **kwargs))
+                if rendered[0].status_code != status.HTTP_200_OK:
+                    return None
+                return rendered[0].data
+
+            data = get_or_compute(key, compute, settings.RESPONSE_CACHE_TIMEOUT,
+                                  changed_ns=version)
+            if data is None:
+                return rendered[0]
+            response = rendered[0] if rendered else Response(data, status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,201 @@
+"""
+Änderungsfeed für Listen-Endpunkte: ?updated_since=<watermark> liefert nur
+die seitdem geänderten Objekte und die IDs gelöschter Objekte (Tombstones).
+
+Antwort: {'results': [...], 'deleted': [ids], 'watermark': str,
+'has_more': bool}. Der Client übergibt den watermark beim nächsten Abruf
+unverändert wieder als updated_since; ein leerer Wert startet die
+Erstsynchronisation. Der watermark ist ein ISO-8601-Zeitstempel, bei
+has_more gefolgt von ',<id>,<tombstone_id>': Einträge mit genau diesem
+Zeitstempel werden dann erst ab diesen IDs geliefert, sodass auch mehr als
+MAX_CHANGES gleichzeitige Änderungen vollständig abgerufen werden.
+Ohne has_more liegt der watermark OVERLAP_SECONDS vor dem Abfragezeitpunkt,
+Objekte können also mehrfach geliefert werden, gehen aber nicht verloren.
+"""
+from datetime import timedelta, timezone as dt_timezone
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from ..models import Tombstone
+from .filters import parse_id
+
+
+class Watermark(NamedTuple):
+    """
+    Position im Änderungsfeed: alles bis einschließlich (at, last_id) bzw.
+    (at, last_tombstone_id) ist geliefert.
+    """
+    at: object
+    last_id: int = 0
+    last_tombstone_id: int = 0
+
+    def __str__(self):
+        # Volle Mikrosekunden, sonst träfe der Vergleich auf at nie zu
+        value = self.at.isoformat()
+        if self.last_id or self.last_tombstone_id:
+            value = f'{value},{self.last_id},{self.last_tombstone_id}'
+        return value
+
+
+def parse_watermark(value):
+    """
+    Liefert den Watermark aus updated_since, None bei leerem Wert.
+    """
+    if not value:
+        return None
+    # Ein nicht kodiertes '+' der Zeitzone kommt als Leerzeichen an
+    parts = value.replace(' ', '+').split(',')
+    ids = [parse_id(part) for part in parts[1:]]
+    since = None
+    if len(parts) in (1, 3) and None not in ids:
+        try:
+            since = parse_datetime(parts[0])
+        except ValueError:
+            pass
+    if since is None:
+        raise ValidationError(
+            {'details': 'updated_since muss ein watermark oder ISO-8601-Zeitstempel sein.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+
+    retention = timedelta(days=settings.DELTA_SYNC['TOMBSTONE_RETENTION_DAYS'])
+    if since < timezone.now() - retention:
+        # Löschungen aus dieser Zeit sind nicht mehr bekannt
+        error = APIException(
+            {'details': 'updated_since ist älter als die Aufbewahrungsfrist, bitte vollständig neu laden.'})
+        error.status_code = status.HTTP_410_GONE
+        raise error
+    return Watermark(since, *ids)
+
+
+def _changed_at(row):
+    return row['updated_at'] if isinstance(row, dict) else row.updated_at
+
+
+def _row_id(row):
+    return row['id'] if isinstance(row, dict) else row.pk
+
+
+def after_watermark(queryset, field, at, last_id):
+    """
+    Filtert auf (field, id) > (at, last_id), d.h. field > at oder
+    field = at und id > last_id, als Bereichsabfrage auf dem Index (field, id).
+    """
+    queryset = queryset.filter(**{f'{field}__gte': at})
+    if last_id:
+        queryset = queryset.exclude(**{field: at, 'id__lte': last_id})
+    return queryset
+
+
+def finish_delta(changes, tombstones, since, now):
+    """
+    Kürzt Änderungen und (id, object_id, deleted_at)-Tupel, die jeweils bis
+    zu MAX_CHANGES + 1 nach (Zeitpunkt, id) sortierte Einträge enthalten,
+    auf einen gemeinsamen Zeitpunkt und liefert
+    (changes, deleted, watermark, has_more).
+    """
+    limit = settings.DELTA_SYNC['MAX_CHANGES']
+    cutoffs = []
+    if len(changes) > limit:
+        changes = changes[:limit]
+        cutoffs.append(_changed_at(changes[-1]))
+    if len(tombstones) > limit:
+        tombstones = tombstones[:limit]
+        cutoffs.append(tombstones[-1][2])
+
+    if cutoffs:
+        at = min(cutoffs)
+        changes = [row for row in changes if _changed_at(row) <= at]
+        tombstones = [entry for entry in tombstones if entry[2] <= at]
+        # Weitere Einträge mit genau diesem Zeitpunkt folgen ab den zuletzt
+        # gelieferten IDs; ohne solche gilt die bisherige Position weiter
+        same = since is not None and since.at == at
+        watermark = Watermark(
+            at,
+            max((_row_id(row) for row in changes if _changed_at(row) == at),
+                default=since.last_id if same else 0),
+            max((entry[0] for entry in tombstones if entry[2] == at),
+                default=since.last_tombstone_id if same else 0))
+    else:
+        watermark = Watermark(now - timedelta(seconds=settings.DELTA_SYNC['OVERLAP_SECONDS']))
+        if since is not None and since.at >= watermark.at:
+            watermark = since
+    return changes, [object_id for _, object_id, _ in tombstones], watermark, bool(cutoffs)
+
+
+class DeltaSyncMixin:
+    """
+    Beantwortet list mit ?updated_since= als Änderungsfeed. Es gelten die
+    Filter und die Sichtbarkeit der normalen Liste; Löschvermerke werden
+    über tombstone_filters (Query-Parameter -> Tombstone-Spalte) gefiltert.
+    """
+    delta_query_param = 'updated_since'
+    tombstone_kind = None
+    tombstone_filters = {}
+
+    def get_tombstone_queryset(self):
+        tombstones = Tombstone.objects.filter(kind=self.tombstone_kind)
+        for param, column in self.tombstone_filters.items():
+            value = parse_id(self.request.query_params.get(param, ''))
+            if value is not None:
+                tombstones = tombstones.filter(**{column: value})
+        return tombstones
+
+    def get_delta_querysets(self, since):
+        """
+        Liefert (projection, änderungen, löschungen), jeweils höchstens
+        MAX_CHANGES + 1 Einträge über die Indizes auf updated_at bzw. deleted_at.
+        """
+        limit = settings.DELTA_SYNC['MAX_CHANGES'] + 1
+        queryset = self.filter_queryset(self.get_queryset())
+        projection = self.get_projection()
+        if projection is not None:
+            queryset = projection.get_queryset(queryset)
+        if since is None:
+            # Erstsynchronisation: Löschungen sind für den Client bedeutungslos
+            return projection, queryset.order_by('updated_at', 'id')[:limit], Tombstone.objects.none()
+        changes = after_watermark(queryset, 'updated_at', since.at, since.last_id)
+        tombstones = after_watermark(
+            self.get_tombstone_queryset(), 'deleted_at', since.at, since.last_tombstone_id)
+        return (projection,
+                changes.order_by('updated_at', 'id')[:limit],
+                tombstones.order_by('deleted_at', 'id').values_list('id', 'object_id', 'deleted_at')[:limit])
+
+    def get_delta_data(self, data, deleted, watermark, has_more):
+        return {'results': data, 'deleted': deleted, 'watermark': str(watermark), 'has_more': has_more}
+
+    def list(self, request, *args, **kwargs):
+        if self.delta_query_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        since = parse_watermark(request.query_params[self.delta_query_param])
+        now = timezone.now()
+        projection, changes, tombstones = self.get_delta_querysets(since)
+        changes, deleted, watermark, has_more = finish_delta(
+            list(changes), list(tombstones), since, now)
+        if projection is not None:
+            data = projection.serialize(changes)
+        else:
+            data = self.get_serializer(changes, many=True).data
+        return Response(self.get_delta_data(data, deleted, watermark, has_more))
+
+    async def alist_delta(self, request):
+        """
+        Async-Variante für die ASGI-Views.
+        """
+        since = parse_watermark(request.query_params[self.delta_query_param])
+        now = timezone.now()
+        projection, changes, tombstones = self.get_delta_querysets(since)
+        changes, deleted, watermark, has_more = finish_delta(
+            [row async for row in changes], [pair async for pair in tombstones], since, now)
+        if projection is not None:
+            data = await projection.aserialize(changes)
+        else:
+            data = self.get_serializer(changes, many=True).data
+        return self.get_delta_data(data, deleted, watermark, has_more)
@@ -0,0 +1,73 @@
+"""
+Sparse Fieldsets (?fields=) und eingebettete Beziehungen (?expand=) für
+lesende Requests.
+
+?fields=id,title,details wählt eine Teilmenge der Felder des Serializers,
+?expand=details,user ersetzt die Verweise durch die vollständigen Daten.
+Beide Angaben gelangen über den Serializer-Kontext bzw. die Projektion
+(siehe projections.py) in die Antwort.
+"""
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+
+def parse_field_list(request, param, allowed):
+    """
+    Liest eine kommagetrennte Feldliste; None, wenn der Parameter fehlt
+    oder leer ist. Unbekannte Namen führen zu einem 400.
+    """
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    names = frozenset(name.strip() for name in value.split(',') if name.strip())
+    unknown = sorted(names.difference(allowed))
+    if unknown:
+        raise ValidationError(
+            {'details': f"Unbekannte Felder für {param}: {', '.join(unknown)}"})
+    return names or None
+
+
+class SparseFieldsetMixin:
+    """
+    Wertet ?fields= und ?expand= für GET-Requests aus. Erlaubte Felder sind
+    die des Serializers (Meta.fields), einbettbar sind expandable_fields.
+    Eingebettete Profile und Details sind wie ihre eigenen Endpunkte nur
+    für angemeldete Nutzer sichtbar, ?expand= erfordert daher eine Anmeldung.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    expandable_fields = ()
+
+    def get_fieldset(self):
+        """
+        Liefert {'fields': frozenset | None, 'expand': frozenset}; fields None
+        bedeutet alle Felder.
+        """
+        if getattr(self, '_fieldset', None) is None:
+            fieldset = {'fields': None, 'expand': frozenset()}
+            if self.request.method in ('GET', 'HEAD'):
+                fieldset['fields'] = parse_field_list(
+                    self.request, self.fields_query_param, self.get_serializer_class().Meta.fields)
+                fieldset['expand'] = parse_field_list(
+                    self.request, self.expand_query_param, self.expandable_fields) or frozenset()
+                if fieldset['expand'] and not self.request.user.is_authenticated:
+                    error = APIException("Benutzer ist nicht authentifiziert.")
+                    error.status_code = status.HTTP_401_UNAUTHORIZED
+                    raise error
+            self._fieldset = fieldset
+        return self._fieldset
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Ungültige Angaben vor dem Laden der Daten mit 400 beantworten
+        self.get_fieldset()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(self.get_fieldset())
+        return context
+
+    def get_projection_kwargs(self):
+        kwargs = super().get_projection_kwargs()
+        kwargs.update(self.get_fieldset())
+        return kwargs
@@ -1,5 +1,22 @@
 import django_filters
+from rest_framework.filters import SearchFilter
 from ..models import Review
+from ..search import get_search_backend
+
+# Größte ID einer bigint-Spalte (SQLite, PostgreSQL)
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_id(value):
+    """
+    Liefert value als ID oder None, wenn es keine Dezimalzahl im Bereich
+    einer bigint-Spalte ist. Die Länge wird vor int() geprüft, das bei sehr
+    langen Ziffernfolgen (über 4300 Stellen) selbst einen Fehler wirft.
+    """
+    if len(value) > len(str(MAX_ID)) or not value.isdecimal():
+        return None
+    number = int(value)
+    return number if number <= MAX_ID else None
 
 class ReviewFilter(django_filters.FilterSet):
     business_user_id = django_filters.NumberFilter(field_name='business_user')
@@ -8,3 +25,15 @@ class ReviewFilter(django_filters.FilterSet):
     class Meta:
         model = Review
         fields = ['business_user_id', 'reviewer_id']
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    Ersetzt die icontains-Suche durch das konfigurierte Such-Backend.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return get_search_backend().search(queryset, query)
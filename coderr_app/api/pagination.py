@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CustomLimitOffsetPagination(PageNumberPagination):
+    page_size = 6
+    page_size_query_param = 'page_size'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor-Pagination über (ordering_field, id) ohne COUNT und ohne OFFSET.
+
+    Der Modus ist opt-in: nur wenn der Parameter ?cursor= (ggf. leer für die
+    erste Seite) übergeben wird, wird absteigend nach ordering_field und id
+    sortiert und seitenweise über den letzten Schlüssel weitergeblättert.
+    Ohne Cursor wird fallback_class verwendet bzw. unpaginiert geantwortet.
+    Views können das Sortierfeld pro Request über keyset_ordering_field
+    überschreiben (Datum oder Zahl). Parameter, die eine andere Sortierung
+    verlangen (cursor_conflicting_params), sind zusammen mit ?cursor= nicht
+    erlaubt und werden mit 400 abgelehnt.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering_field = 'created_at'
+    fallback_class = None
+    invalid_cursor_message = 'Ungültiger Cursor.'
+    cursor_conflicting_params = ()
+
+    def __init__(self):
+        self.fallback = self.fallback_class() if self.fallback_class else None
+        self.use_fallback = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.use_fallback = True
+            if self.fallback is None:
+                return None
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.check_cursor_params(request)
+        self.request = request
+        self.ordering_field = getattr(view, 'keyset_ordering_field', None) or self.ordering_field
+        return self.finish_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async-Variante von paginate_queryset für die ASGI-Views.
+        """
+        if self.cursor_query_param not in request.query_params:
+            self.use_fallback = True
+            if self.fallback is None:
+                return None
+            return await apaginate_page_number(self.fallback, queryset, request)
+
+        self.check_cursor_params(request)
+        self.request = request
+        self.ordering_field = getattr(view, 'keyset_ordering_field', None) or self.ordering_field
+        return self.finish_page([row async for row in self.get_page_queryset(queryset, request)])
+
+    def check_cursor_params(self, request):
+        conflicting = [name for name in self.cursor_conflicting_params
+                       if request.query_params.get(name)]
+        if conflicting:
+            raise ValidationError(
+                {'details': f"{', '.join(conflicting)} kann nicht mit {self.cursor_query_param} kombiniert werden."})
+
+    def get_page_queryset(self, queryset, request):
+        self.current_page_size = self.get_page_size(request)
+        queryset = queryset.order_by(f'-{self.ordering_field}', '-id')
+
+        position = self.decode_cursor(
+            request.query_params[self.cursor_query_param])
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__lt': value}) |
+                Q(**{self.ordering_field: value, 'id__lt': pk})
+            )
+        # Ein Datensatz mehr, um zu erkennen, ob es eine nächste Seite gibt
+        return queryset[:self.current_page_size + 1]
+
+    def finish_page(self, rows):
+        page = rows[:self.current_page_size]
+        self.next_position = None
+        if len(rows) > self.current_page_size:
+            last = page[-1]
+            if isinstance(last, dict):
+                # Zeilen aus .values() (siehe projections.py)
+                self.next_position = (last[self.ordering_field], last['id'])
+            else:
+                self.next_position = (getattr(last, self.ordering_field), last.pk)
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, position):
+        value, pk = position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([value, pk]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(value)
+            return value, int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        if self.use_fallback:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response_schema(schema)
+        return super().get_paginated_response_schema(schema)
+
+
+async def apaginate_page_number(paginator, queryset, request):
+    """
+    Async-Gegenstück zu PageNumberPagination.paginate_queryset.
+
+    COUNT und Seitenabfrage sind unabhängig und laufen per asyncio.gather
+    nebeneinander; die Seitennummer wird anschließend wie bei DRF geprüft.
+    """
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+
+    page_number = request.query_params.get(paginator.page_query_param) or 1
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    try:
+        offset = (int(page_number) - 1) * page_size
+    except ValueError:
+        offset = None
+
+    if offset is not None and offset >= 0:
+        count, rows = await asyncio.gather(
+            queryset.acount(),
+            _afetch(queryset[offset:offset + page_size]),
+        )
+    else:
+        count, rows = await queryset.acount(), None
+    # Paginator.count ist eine cached_property und wird hier vorbelegt
+    django_paginator.__dict__['count'] = count
+    if page_number in paginator.last_page_strings:
+        page_number = django_paginator.num_pages
+
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(
+            page_number=page_number, message=str(exc)))
+    if rows is None:
+        rows = await _afetch(page.object_list)
+    page.object_list = rows
+
+    paginator.page = page
+    paginator.request = request
+    return rows
+
+
+async def _afetch(queryset):
+    return [row async for row in queryset]
+
+
+class OfferPagination(KeysetPagination):
+    ordering_field = 'updated_at'
+    fallback_class = CustomLimitOffsetPagination
+    # OrderingFilter und die Relevanz-Sortierung der Suche würden sonst
+    # durch die Cursor-Sortierung verworfen
+    cursor_conflicting_params = ('ordering', 'search')
@@ -0,0 +1,291 @@
+"""
+Schneller Lesepfad für Listen: Zeilen werden per .values() geladen und
+direkt in die JSON-Form des jeweiligen Serializers übertragen, ohne
+Modellinstanzen und ohne Serializer-Instanz pro Request.
+
+Die Umwandlung der einfachen Felder wird einmal pro Klasse aus den Feldern
+des Serializers abgeleitet (dieselben to_representation-Methoden), sodass
+die Ausgabe identisch bleibt; Felder, die nicht direkt einer Spalte
+entsprechen, brauchen eine project_<feld>-Methode. ?fields= und ?expand=
+(siehe fieldsets.py) werden über fields und expand berücksichtigt.
+"""
+import time
+from collections import defaultdict
+from functools import cached_property
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from ..models import CustomUser, OfferDetail
+from ..profiling import current_profile
+from .serializers import (OfferDetailSerializer, OfferSerializer, OfferUserSerializer, OrderSerializer,
+                          ReviewSerializer, variant_urls)
+
+
+# Platzhalter-ID, um Detail-URLs einmal pro Request aufzulösen
+_PK_PLACEHOLDER = 987654321
+
+
+class ValuesProjection:
+    """
+    Basisklasse: serializer_class gibt die Ausgabeform vor, field_columns
+    listet je Feld die Spalten, die project_<feld>- bzw. expand_<feld>-
+    Methoden zusätzlich lesen. required_columns werden immer geladen.
+
+    fields schränkt die Ausgabe (und die geladenen Spalten) ein, expand
+    nennt Felder, deren Wert expand_<feld>(row) liefert.
+    """
+    serializer_class = None
+    required_columns = ('id',)
+    field_columns = {}
+
+    def __init__(self, request, fields=None, expand=()):
+        self.request = request
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def get_converters(cls):
+        """
+        Liefert [(feld, spalte, umwandlung)]; spalte None bedeutet, dass
+        project_<feld>(row) den Wert berechnet. Wird pro Klasse gecacht.
+        """
+        if '_converters' not in cls.__dict__:
+            cls._converters = cls.build_converters()
+        return cls._converters
+
+    @classmethod
+    def build_converters(cls):
+        # OfferSerializer.get_fields wertet die Request-Methode aus
+        fake_request = type('ProjectionRequest', (), {'method': 'GET'})()
+        serializer = cls.serializer_class(context={'request': fake_request})
+        converters = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if hasattr(cls, f'project_{name}'):
+                converters.append((name, None, None))
+            elif isinstance(field, serializers.RelatedField):
+                # .values('<fk>') liefert bereits den Primärschlüssel
+                converters.append((name, field.source, None))
+            elif isinstance(field, serializers.FileField):
+                converters.append((name, field.source, '_file_url'))
+            elif isinstance(field, (serializers.SerializerMethodField,
+                                    serializers.BaseSerializer, serializers.ReadOnlyField)):
+                raise ImproperlyConfigured(
+                    f'{cls.__name__} benötigt project_{name}() für {type(field).__name__}.')
+            else:
+                converters.append((name, field.source, field.to_representation))
+        return converters
+
+    def is_selected(self, name):
+        return self.fields is None or name in self.fields
+
+    @cached_property
+    def field_converters(self):
+        """
+        Die Konverter der ausgewählten Felder als (feld, spalte, umwandlung, methode).
+        """
+        converters = []
+        for name, column, convert in self.get_converters():
+            if not self.is_selected(name):
+                continue
+            if name in self.expand:
+                converters.append((name, None, None, getattr(self, f'expand_{name}')))
+            elif column is None:
+                converters.append((name, None, None, getattr(self, f'project_{name}')))
+            else:
+                converters.append((name, column, getattr(self, convert) if isinstance(convert, str)
+                                   else convert, None))
+        return converters
+
+    def get_columns(self):
+        columns = list(self.required_columns)
+        for name, column, _, _ in self.field_converters:
+            if column is not None:
+                columns.append(column)
+            columns.extend(self.field_columns.get(name, ()))
+        return list(dict.fromkeys(columns))
+
+    def get_queryset(self, queryset):
+        # extra()-Spalten (z. B. search_rank) mitnehmen, da nach ihnen sortiert wird
+        columns = self.get_columns() + list(queryset.query.extra)
+        if not queryset.ordered:
+            # Mit weniger Spalten kann die Datenbank einen anderen Index und damit
+            # eine andere Reihenfolge wählen; pk entspricht der bisherigen Ordnung
+            queryset = queryset.order_by('pk')
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def get_related_querysets(self, rows):
+        """
+        Liefert {name: queryset} der für eine Seite nachzuladenden Daten,
+        je Beziehung genau eine Abfrage.
+        """
+        return {}
+
+    def set_related(self, related):
+        """
+        Übernimmt die nachgeladenen Zeilen ({name: liste}) für project_/expand_.
+        """
+
+    def load_related(self, rows):
+        querysets = self.get_related_querysets(rows) if rows else {}
+        self.set_related({name: list(queryset) for name, queryset in querysets.items()})
+
+    async def aload_related(self, rows):
+        querysets = self.get_related_querysets(rows) if rows else {}
+        self.set_related({name: [row async for row in queryset]
+                          for name, queryset in querysets.items()})
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.load_related(rows)
+        return self.represent(rows)
+
+    async def aserialize(self, rows):
+        rows = [row async for row in rows] if hasattr(rows, '__aiter__') else list(rows)
+        await self.aload_related(rows)
+        return self.represent(rows)
+
+    def represent(self, rows):
+        start = time.perf_counter()
+        converters = self.field_converters
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert, project in converters:
+                if project is not None:
+                    item[name] = project(row)
+                    continue
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        profile = current_profile()
+        if profile is not None:
+            profile.serializer_time += time.perf_counter() - start
+        return data
+
+    def _file_url(self, name):
+        if not name:
+            return None
+        return self.request.build_absolute_uri(default_storage.url(name))
+
+
+class OfferDetailProjection(ValuesProjection):
+    serializer_class = OfferDetailSerializer
+    required_columns = ('id', 'offer_id')
+
+
+class OfferUserProjection(ValuesProjection):
+    serializer_class = OfferUserSerializer
+    field_columns = {'file_variants': ('file_variants',)}
+
+    def project_file_variants(self, row):
+        return variant_urls(row['file_variants'], self.request)
+
+
+class OfferProjection(ValuesProjection):
+    serializer_class = OfferSerializer
+    # updated_at wird für den Cursor der Keyset-Pagination gelesen
+    required_columns = ('id', 'updated_at')
+    field_columns = {
+        'user_details': ('user__first_name', 'user__last_name', 'user__username'),
+        'image_variants': ('image_variants',),
+        'min_price': ('min_price',),
+        'min_delivery_time': ('min_delivery_time',),
+        'user': ('user',),
+    }
+
+    def get_related_querysets(self, rows):
+        offer_ids = [row['id'] for row in rows]
+        querysets = {}
+        if self.is_selected('details'):
+            # Gleiche Abfrage wie prefetch_related('details')
+            details = OfferDetail.objects.filter(offer__in=offer_ids)
+            if 'details' in self.expand:
+                self.detail_projection = OfferDetailProjection(self.request)
+                querysets['details'] = self.detail_projection.get_queryset(details)
+            else:
+                querysets['details'] = details.values_list('offer_id', 'id')
+        if self.is_selected('user') and 'user' in self.expand:
+            self.user_projection = OfferUserProjection(self.request)
+            querysets['user'] = self.user_projection.get_queryset(
+                CustomUser.objects.filter(pk__in={row['user'] for row in rows}))
+        return querysets
+
+    def set_related(self, related):
+        self.details = defaultdict(list)
+        if related.get('details') and 'details' in self.expand:
+            rows = related['details']
+            for row, item in zip(rows, self.detail_projection.represent(rows)):
+                self.details[row['offer_id']].append(item)
+        elif related.get('details'):
+            prefix, suffix = reverse('offerdetails-detail', kwargs={'pk': _PK_PLACEHOLDER},
+                                     request=self.request).split(str(_PK_PLACEHOLDER))
+            for offer_id, pk in related['details']:
+                self.details[offer_id].append({'id': pk, 'url': f'{prefix}{pk}{suffix}'})
+        rows = related.get('user')
+        self.users = {row['id']: item for row, item in
+                      zip(rows, self.user_projection.represent(rows))} if rows else {}
+
+    def project_details(self, row):
+        return self.details[row['id']]
+
+    expand_details = project_details
+
+    def expand_user(self, row):
+        return self.users.get(row['user'])
+
+    def project_image_variants(self, row):
+        return variant_urls(row['image_variants'], self.request)
+
+    def project_user_details(self, row):
+        return {
+            "first_name": row['user__first_name'],
+            "last_name": row['user__last_name'],
+            "username": row['user__username'],
+        }
+
+    def project_min_price(self, row):
+        return row['min_price']
+
+    def project_min_delivery_time(self, row):
+        return row['min_delivery_time']
+
+
+class OrderProjection(ValuesProjection):
+    serializer_class = OrderSerializer
+
+
+class ReviewProjection(ValuesProjection):
+    serializer_class = ReviewSerializer
+
+
+class ProjectedListMixin:
+    """
+    Beantwortet GET-Listen über projection_class statt über den Serializer;
+    alle anderen Aktionen bleiben unverändert.
+    """
+    projection_class = None
+
+    def get_projection_kwargs(self):
+        return {}
+
+    def get_projection(self):
+        if self.projection_class is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        return self.projection_class(self.request, **self.get_projection_kwargs())
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = projection.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.serialize(page))
+        return Response(projection.serialize(queryset))
@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Datum/Zeit, Decimal, Lazy-Strings usw. wie DRFs JSONEncoder behandeln,
+    # damit die Ausgabe mit JSONRenderer übereinstimmt
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer auf Basis von orjson mit identischer Ausgabe.
+
+    Ohne installiertes orjson oder bei angeforderter Einrückung
+    (Accept: application/json; indent=4) wird DRFs JSONRenderer verwendet.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default,
+                           option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+        # Wie JSONRenderer: U+2028/U+2029 maskieren, damit die Ausgabe gültiges JavaScript bleibt
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
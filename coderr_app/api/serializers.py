@@ -1,5 +1,31 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
 from rest_framework import serializers
-from ..models import Offer, OfferDetail, Order, CustomUser, Review, BaseInfo
+from ..models import Offer, OfferDetail, Order, CustomUser, Review, BaseInfo, BusinessProfileStats
+from ..stats import rating_summary
+
+
+def variant_urls(value, request):
+    """
+    Wandelt gespeicherte Bildvarianten in {breite: {format: url}} mit absoluten URLs um.
+    """
+    variants = {}
+    for width, formats in (value or {}).items():
+        variants[width] = {}
+        for variant_format, name in formats.items():
+            url = default_storage.url(name)
+            variants[width][variant_format] = request.build_absolute_uri(
+                url) if request is not None else url
+    return variants
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Gibt die Bildvarianten als {breite: {format: url}} mit absoluten URLs aus.
+    """
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get('request'))
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -31,14 +57,27 @@ class OfferDetailLinkSerializer(serializers.ModelSerializer):
         fields = ['id', 'url']
 
 
+class OfferUserSerializer(serializers.ModelSerializer):
+    """
+    Öffentliche Anbieterdaten für ?expand=user (ohne E-Mail und Telefon).
+    """
+    file_variants = ImageVariantsField()
+
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username', 'first_name', 'last_name', 'file', 'file_variants',
+                  'location', 'description', 'working_hours', 'type']
+
+
 class OfferSerializer(serializers.ModelSerializer):
     user_details = serializers.SerializerMethodField()
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image',
+        fields = ['id', 'user', 'title', 'image', 'image_variants',
                   'description', 'details', 'created_at', 'updated_at', 'user_details', 'min_price', 'min_delivery_time']
         extra_kwargs = {
             'user': {'read_only': True}
@@ -50,17 +89,25 @@ class OfferSerializer(serializers.ModelSerializer):
         if self.context['request'].method in ['POST', 'PATCH', 'PUT']:
             fields['details'] = OfferDetailSerializer(many=True)
         else:
-            fields['details'] = OfferDetailLinkSerializer(many=True)
+            # ?expand= und ?fields= (siehe fieldsets.py)
+            expand = self.context.get('expand', ())
+            if 'details' in expand:
+                fields['details'] = OfferDetailSerializer(many=True, read_only=True)
+            else:
+                fields['details'] = OfferDetailLinkSerializer(many=True)
+            if 'user' in expand:
+                fields['user'] = OfferUserSerializer(read_only=True)
+            selected = self.context.get('fields')
+            if selected is not None:
+                fields = {name: field for name, field in fields.items() if name in selected}
 
         return fields
 
     def get_min_price(self, obj):
-        offer_details = obj.details.all()
-        return min(detail.price for detail in offer_details)
+        return obj.min_price
 
     def get_min_delivery_time(self, obj):
-        offer_details = obj.details.all()
-        return min(detail.delivery_time_in_days for detail in offer_details)
+        return obj.min_delivery_time
 
     def get_user_details(self, obj):
         user = obj.user
@@ -86,17 +133,18 @@ class OfferSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         details_data = validated_data.pop('details')
         validated_data['user'] = self.context['request'].user
-        offer = super().create(validated_data)
-
-        self._create_or_update_offer_details(offer, details_data)
+        with transaction.atomic():
+            offer = super().create(validated_data)
+            self._create_or_update_offer_details(offer, details_data)
         return offer
 
     def update(self, instance, validated_data):
         details_data = validated_data.pop('details', None)
-        instance = super().update(instance, validated_data)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
 
-        if details_data:
-            self._create_or_update_offer_details(instance, details_data)
+            if details_data:
+                self._create_or_update_offer_details(instance, details_data)
 
         return instance
 
@@ -104,14 +152,47 @@ class OfferSerializer(serializers.ModelSerializer):
         return obj.image.url if obj.image else None
 
     def _create_or_update_offer_details(self, offer, details_data):
+        """
+        Legt Details je offer_type an oder aktualisiert sie mit festen Statements:
+        eine Abfrage der vorhandenen Details, ein bulk_create, ein bulk_update
+        und ein UPDATE der Zusammenfassungsspalten des Angebots.
+
+        Muss innerhalb einer Transaktion laufen, in der die Angebotszeile
+        bereits geschrieben (und damit gesperrt) wurde.
+        """
+        user = self.context['request'].user
+        details = {
+            detail.offer_type: detail for detail in OfferDetail.objects.filter(offer=offer)}
+        new_details, changed_details, changed_fields = [], [], {'user'}
+
         for detail_data in details_data:
             offer_type = detail_data.get('offer_type')
-            detail_instance, created = OfferDetail.objects.update_or_create(
-                offer=offer,
-                offer_type=offer_type,
-                user=self.context['request'].user,
-                defaults=detail_data
-            )
+            detail = details.get(offer_type)
+            if detail is None:
+                detail = OfferDetail(offer=offer, user=user, **detail_data)
+                details[offer_type] = detail
+                new_details.append(detail)
+                continue
+            for field, value in detail_data.items():
+                setattr(detail, field, value)
+            detail.user = user
+            if detail.pk is not None and detail not in changed_details:
+                changed_details.append(detail)
+            changed_fields.update(detail_data)
+
+        if new_details:
+            OfferDetail.objects.bulk_create(new_details)
+        if changed_details:
+            OfferDetail.objects.bulk_update(
+                changed_details, sorted(changed_fields))
+
+        # bulk_create/bulk_update lösen keine Signale aus
+        offer.min_price = min(
+            (detail.price for detail in details.values()), default=None)
+        offer.min_delivery_time = min(
+            (detail.delivery_time_in_days for detail in details.values()), default=None)
+        Offer.objects.filter(pk=offer.pk).update(
+            min_price=offer.min_price, min_delivery_time=offer.min_delivery_time)
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -141,21 +222,23 @@ class OrderDetailSerializer(serializers.ModelSerializer):
 
 class UserSerializer(serializers.ModelSerializer):
     user = serializers.IntegerField(source='id')
+    file_variants = ImageVariantsField()
 
     class Meta:
         model = CustomUser
         fields = ["user", "username", "first_name",
-                  "last_name", "file", "location", "tel", "description", "working_hours", "type",
+                  "last_name", "file", "file_variants", "location", "tel", "description", "working_hours", "type",
                   "email", "created_at"]
 
 
 class BusinessUserSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
+    rating_stats = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
         fields = ['user', 'file', 'location', 'tel',
-                  'description', 'working_hours', 'type']
+                  'description', 'working_hours', 'type', 'rating_stats']
 
     def get_user(self, obj):
         return {
@@ -165,6 +248,13 @@ class BusinessUserSerializer(serializers.ModelSerializer):
             'last_name': obj.last_name
         }
 
+    def get_rating_stats(self, obj):
+        try:
+            stats = obj.profile_stats
+        except BusinessProfileStats.DoesNotExist:
+            stats = BusinessProfileStats(user=obj)
+        return rating_summary(stats)
+
 
 class CustomerUserSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
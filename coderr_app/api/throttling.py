@@ -0,0 +1,156 @@
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections, router
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from ..caching import has_atomic_incr
+from ..models import RateCounter
+
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Wandelt z. B. '10/min' in (10, 60) um.
+    """
+    count, period = rate.split('/')
+    return int(count), DURATIONS[period[0]]
+
+
+def _counter_connection():
+    # Zähler immer auf dem Primärserver lesen und schreiben
+    return connections[router.db_for_write(RateCounter)]
+
+
+def read_counters(keys):
+    """
+    Liefert {schlüssel: zählerstand} der noch gültigen Zähler.
+    """
+    if has_atomic_incr():
+        return cache.get_many(keys)
+    connection = _counter_connection()
+    table = connection.ops.quote_name(RateCounter._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT "key", "count" FROM {table} WHERE "key" IN ({", ".join(["%s"] * len(keys))})'
+            ' AND "expires_at" > %s',
+            [*keys, connection.ops.adapt_datetimefield_value(timezone.now())])
+        return dict(cursor.fetchall())
+
+
+def increment_counter(key, timeout):
+    """
+    Erhöht einen Zähler atomar und legt ihn mit Ablauf timeout an.
+
+    Im Cache nur, wenn dessen incr atomar ist und den Ablauf behält (Redis,
+    Memcached, locmem); sonst mit einem einzigen INSERT ... ON CONFLICT DO
+    UPDATE auf RateCounter (SQLite, PostgreSQL). Da die Schlüssel das
+    Zeitfenster enthalten, wird eine Zeile nie wiederverwendet; abgelaufene
+    Zeilen entfernt manage.py prune_rate_counters.
+    """
+    if has_atomic_incr():
+        if not cache.add(key, 1, timeout):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Eintrag ist zwischen add und incr abgelaufen
+                cache.set(key, 1, timeout)
+        return
+
+    connection = _counter_connection()
+    table = connection.ops.quote_name(RateCounter._meta.db_table)
+    expires_at = timezone.now() + timedelta(seconds=timeout)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ("key", "count", "expires_at") VALUES (%s, 1, %s)'
+            f' ON CONFLICT ("key") DO UPDATE SET "count" = {table}."count" + 1',
+            [key, connection.ops.adapt_datetimefield_value(expires_at)])
+
+
+def prune_rate_counters():
+    """
+    Entfernt abgelaufene Zähler; gibt deren Anzahl zurück.
+    """
+    return RateCounter.objects.filter(expires_at__lte=timezone.now()).delete()[0]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Gleitendes Zeitfenster, angenähert über zwei feste Fenster im
+    gemeinsamen Cache.
+
+    Geschätzt wird anteilig_vorheriges_fenster + aktuelles_fenster; pro
+    Request fallen ein Lesen beider Zähler und ein atomares Erhöhen an, statt wie bei DRFs
+    SimpleRateThrottle eine Liste aller Zeitstempel zu lesen und zu schreiben.
+    Die Raten stehen in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] (None = kein Limit).
+    """
+    scope = None
+    timer = time.time
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def get_ident_key(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+        self.limit, self.window = parse_rate(rate)
+
+        index, elapsed = divmod(self.timer(), self.window)
+        base = f'coderr:throttle:{scope}:{self.get_ident_key(request)}'
+        current_key, previous_key = f'{base}:{int(index)}', f'{base}:{int(index) - 1}'
+        counts = read_counters([previous_key, current_key])
+        previous, current = counts.get(previous_key, 0), counts.get(current_key, 0)
+
+        fraction = elapsed / self.window
+        if previous * (1 - fraction) + current + 1 > self.limit:
+            self.wait_seconds = self.compute_wait(previous, current, fraction)
+            return False
+
+        increment_counter(current_key, self.window * 2)
+        return True
+
+    def compute_wait(self, previous, current, fraction):
+        if current + 1 <= self.limit:
+            # Warten, bis der Anteil des vorherigen Fensters weit genug gesunken ist
+            needed = 1 - (self.limit - current - 1) / previous
+            return (needed - fraction) * self.window
+        # Erst im nächsten Fenster, wenn das aktuelle zum vorherigen wird
+        needed = max(1 - (self.limit - 1) / current, 0)
+        return (1 - fraction + needed) * self.window
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class AuthRateThrottle(SlidingWindowThrottle):
+    """
+    Login und Registrierung (Passwort-Hashing) pro IP-Adresse begrenzen.
+    """
+    scope = 'auth'
+
+    def get_ident_key(self, request):
+        return f'ip:{self.get_ident(request)}'
+
+
+class ReadWriteRateThrottle(SlidingWindowThrottle):
+    """
+    Getrennte Limits für lesende und schreibende Requests, pro Nutzer bzw.
+    für anonyme Requests pro IP-Adresse.
+    """
+
+    def get_scope(self, request, view):
+        return 'read' if request.method in SAFE_METHODS else 'write'
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import OfferViewSet, OfferDetailViewSet, OrderViewSet, OrderCountViewSet, CompletedOrderCountViewSet, ProfilViewSet, ProfilTypeViewSet, LoginAPIView, RegistrationView, ReviewsViewSet, BaseInfoView
+from . import async_views
+from .views import OfferViewSet, OfferDetailViewSet, OrderViewSet, OrderCountViewSet, CompletedOrderCountViewSet, OrderStatsViewSet, RatingStatsViewSet, ProfilViewSet, ProfilTypeViewSet, LoginAPIView, LogoutAPIView, RegistrationView, ReviewsViewSet, BaseInfoView
 
 router = DefaultRouter()
 router.register(r'offers', OfferViewSet, basename='offers')
@@ -9,6 +10,8 @@ router.register(r'orders', OrderViewSet, basename='orders')
 router.register(r'order-count', OrderCountViewSet, basename='order-count')
 router.register(r'completed-order-count',
                 CompletedOrderCountViewSet, basename='completed-order-count')
+router.register(r'order-stats', OrderStatsViewSet, basename='order-stats')
+router.register(r'rating-stats', RatingStatsViewSet, basename='rating-stats')
 router.register(r'profile', ProfilViewSet, basename='profile')
 router.register(r'reviews', ReviewsViewSet, basename='reviews')
 router.register(r'base-info', BaseInfoView, basename='base-info')
@@ -18,5 +21,20 @@ urlpatterns = [
     path('profiles/<str:user_type>/',
          ProfilTypeViewSet.as_view(), name='profilType-detail'),
     path('login/', LoginAPIView.as_view(), name='login-detail'),
+    path('logout/', LogoutAPIView.as_view(), name='logout-detail'),
     path('registration/', RegistrationView.as_view(), name='registration-detail'),
+
+    # Async-Varianten der lesenden Endpunkte (ASGI)
+    path('async/offers/', async_views.offer_list, name='async-offers-list'),
+    path('async/offers/<int:pk>/', async_views.offer_detail,
+         name='async-offers-detail'),
+    path('async/reviews/', async_views.review_list, name='async-reviews-list'),
+    path('async/base-info/', async_views.base_info,
+         name='async-base-info-list'),
+    path('async/order-count/<str:pk>/', async_views.order_count,
+         name='async-order-count-detail'),
+    path('async/completed-order-count/<str:pk>/', async_views.completed_order_count,
+         name='async-completed-order-count-detail'),
+    path('async/order-stats/<str:pk>/', async_views.order_stats,
+         name='async-order-stats-detail'),
 ]
@@ -6,17 +6,29 @@ from rest_framework import status, mixins, viewsets
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from rest_framework.permissions import AllowAny
 from .permissions import IsOwnerOrAdmin, IsBusinessUser, IsSuperUser, IsOwnUserOrAdmin, IsAuthenticatedCustom, IsAuthenticatedOrRealOnlyCustom, IsCustomerUser
-from rest_framework.pagination import PageNumberPagination, LimitOffsetPagination
-from django.db.models import Min, Avg
-from decimal import Decimal
+from .pagination import KeysetPagination, OfferPagination
 from rest_framework.exceptions import PermissionDenied, ValidationError
-from .filters import ReviewFilter
+from .filters import ReviewFilter, OfferSearchFilter
+from ..stats import get_base_info, get_order_counts, get_rating_stats
+from ..profiling import ProfiledViewMixin
+from ..caching import OFFER_CACHE_NAMESPACE
+from .batch import BatchRetrieveMixin
+from .caching import CachedResponseMixin
+from .delta import DeltaSyncMixin
+from .fieldsets import SparseFieldsetMixin
+from .projections import OfferProjection, OrderProjection, ProjectedListMixin, ReviewProjection
+from .throttling import AuthRateThrottle, ReadWriteRateThrottle
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 
 
 class LoginAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle, ReadWriteRateThrottle]
 
     def post(self, request):
         username = request.data.get("username")
@@ -34,8 +46,17 @@ class LoginAPIView(APIView):
             return Response({"error": "Invalid username or password."}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutAPIView(APIView):
+    permission_classes = [IsAuthenticatedCustom]
+
+    def post(self, request):
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class RegistrationView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle, ReadWriteRateThrottle]
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
@@ -55,25 +76,29 @@ class RegistrationView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CustomLimitOffsetPagination(PageNumberPagination):
-    page_size = 6
-    page_size_query_param = 'page_size'
-
-
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(ProfiledViewMixin, CachedResponseMixin, SparseFieldsetMixin, DeltaSyncMixin,
+                   ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Offer.objects.all()
     serializer_class = OfferSerializer
+    projection_class = OfferProjection
     permission_classes = [IsAuthenticatedOrRealOnlyCustom, IsBusinessUser,
                           IsOwnerOrAdmin]
-    pagination_class = CustomLimitOffsetPagination
+    pagination_class = OfferPagination
+    filter_backends = [OfferSearchFilter,
+                       DjangoFilterBackend, OrderingFilter]
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
+    expandable_fields = ('details', 'user')
+    tombstone_kind = 'offer'
+    tombstone_filters = {'creator_id': 'business_user_id'}
+    cache_namespace = OFFER_CACHE_NAMESPACE
+    cache_query_params = ['search', 'ordering', 'creator_id', 'min_price',
+                          'max_delivery_time', 'page', 'page_size', 'cursor', 'fields', 'expand',
+                          'updated_since']
 
     def get_queryset(self):
-        queryset = Offer.objects.annotate(
-            min_price=Min('details__price'),
-            max_delivery_time=Min('details__delivery_time_in_days')
-        )
+        queryset = Offer.objects.select_related(
+            'user').prefetch_related('details')
 
         # Filter nach Ersteller
         creator_id_param = self.request.query_params.get('creator_id')
@@ -100,7 +125,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         if max_delivery_time_param:
             if max_delivery_time_param.isdigit():
                 queryset = queryset.filter(
-                    max_delivery_time__lte=int(max_delivery_time_param))
+                    min_delivery_time__lte=int(max_delivery_time_param))
             else:
                 raise ValidationError(
                     {'details': 'max_delivery_time muss eine Zahl sein'})
@@ -121,33 +146,38 @@ class OfferViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
     def retrieve(self, request, pk=None):
-        if request.user.is_authenticated:
-            try:
-                offer = self.get_object()
-                serializer = OfferSerializer(
-                    offer, context={'request': request})
-                user = offer.user 
-            except:
-                return Response({'details': 'Das Angebot mit der angegebenen ID wurde nicht gefunden.'}, status=status.HTTP_404_NOT_FOUND)
-        else:
+        if not request.user.is_authenticated:
             return Response({'details': 'Benutzer ist nicht authentifiziert.'}, status=status.HTTP_401_UNAUTHORIZED)
+        return self.cached_response(request, self.retrieve_offer, pk=pk)
+
+    def retrieve_offer(self, request, pk=None):
+        try:
+            offer = self.get_object()
+            serializer = self.get_serializer(offer)
+            user = offer.user
+        except:
+            return Response({'details': 'Das Angebot mit der angegebenen ID wurde nicht gefunden.'}, status=status.HTTP_404_NOT_FOUND)
 
      # Serialisierte Offer-Daten
         offer_data = serializer.data
 
         # Ergänzte User-Daten
-        offer_data["user_details"] = {
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "username": user.username
-        }
+        if "user_details" in offer_data:
+            offer_data["user_details"] = {
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "username": user.username
+            }
 
         return Response(offer_data, status=status.HTTP_200_OK)
 
 
-class OfferDetailViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet,
-                         mixins.DestroyModelMixin):
+class OfferDetailViewSet(ProfiledViewMixin, BatchRetrieveMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin,
+                         viewsets.GenericViewSet, mixins.DestroyModelMixin):
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
     permission_classes = [IsAuthenticatedCustom & IsSuperUser]
@@ -161,9 +191,12 @@ class OfferDetailViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, vie
             return Response({'details': 'Das Angebot mit der angegebenen ID wurde nicht gefunden.'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ProfiledViewMixin, DeltaSyncMixin, ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
+    projection_class = OrderProjection
     permission_classes = [IsAuthenticatedCustom]
+    pagination_class = KeysetPagination
+    tombstone_kind = 'order'
 
     def get_queryset(self):
         if self.request.user.type == 'customer':
@@ -172,6 +205,13 @@ class OrderViewSet(viewsets.ModelViewSet):
             queryset = Order.objects.filter(business_user=self.request.user)
         return queryset
 
+    def get_tombstone_queryset(self):
+        # Gleiche Sichtbarkeit wie get_queryset
+        tombstones = super().get_tombstone_queryset()
+        if self.request.user.type == 'customer':
+            return tombstones.filter(user_id=self.request.user.pk)
+        return tombstones.filter(business_user_id=self.request.user.pk)
+
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderDetailSerializer
@@ -232,43 +272,72 @@ class OrderViewSet(viewsets.ModelViewSet):
                 {'details': 'Benutzer hat keine Berechtigung, die Bestellung zu löschen.'}, status=status.HTTP_403_FORBIDDEN)
 
 
-class OrderCountViewSet(viewsets.ViewSet):
+class BusinessStatsViewSet(viewsets.ViewSet):
+    """
+    Basis der Statistik-Endpunkte eines Business-Profils.
+
+    load_stats liefert die Zähler (None bei unbekanntem Profil, dann 404),
+    build_response formt daraus die Antwortdaten.
+    """
     permission_classes = [IsAuthenticatedCustom]
 
+    def load_stats(self, pk):
+        return get_order_counts(pk)
+
+    def build_response(self, counts):
+        raise NotImplementedError
+
     def retrieve(self, request, pk=None):
         try:
-            business_user = CustomUser.objects.filter(pk=pk).first()
+            counts = self.load_stats(pk)
+        except (ValueError, TypeError):
+            counts = None
 
-            if business_user.type != 'business':
-                return Response({"error": "Kein Geschäftsnutzer mit der angegebenen ID gefunden"}, status=status.HTTP_404_NOT_FOUND)
-
-            order_count = Order.objects.filter(
-                business_user=business_user, status='in_progress'
-            ).count()
-            return Response({"order_count": order_count})
-        except:
+        if counts is None:
             return Response({"error": "Kein Geschäftsnutzer mit der angegebenen ID gefunden"}, status=status.HTTP_404_NOT_FOUND)
 
+        return Response(self.build_response(counts))
 
-class CompletedOrderCountViewSet(viewsets.ViewSet):
-    permission_classes = [IsAuthenticatedCustom]
 
-    def retrieve(self, request, pk=None):
-        try:
-            business_user = CustomUser.objects.filter(pk=pk).first()
+class OrderCountViewSet(BusinessStatsViewSet):
 
-            if business_user.type != 'business':
-                return Response({"error": "Kein Geschäftsnutzer mit der angegebenen ID gefunden"}, status=status.HTTP_404_NOT_FOUND)
+    def build_response(self, counts):
+        return {"order_count": counts['in_progress']}
 
-            order_count = Order.objects.filter(
-                business_user=business_user, status='completed'
-            ).count()
-            return Response({"completed_order_count": order_count})
-        except:
-            return Response({"error": "Kein Geschäftsnutzer mit der angegebenen ID gefunden"}, status=status.HTTP_404_NOT_FOUND)
+
+class CompletedOrderCountViewSet(BusinessStatsViewSet):
+
+    def build_response(self, counts):
+        return {"completed_order_count": counts['completed']}
+
+
+class OrderStatsViewSet(BusinessStatsViewSet):
+    """
+    Alle Bestellzähler eines Business-Profils in einer Antwort.
+    """
+
+    def build_response(self, counts):
+        return {
+            "order_count": counts['in_progress'],
+            "completed_order_count": counts['completed'],
+            "cancelled_order_count": counts['cancelled'],
+        }
+
+
+class RatingStatsViewSet(BusinessStatsViewSet):
+    """
+    Bewertungsanzahl, Durchschnitt und Sterne-Histogramm eines Business-Profils.
+    """
+
+    def load_stats(self, pk):
+        return get_rating_stats(pk)
+
+    def build_response(self, counts):
+        return counts
 
 
-class ProfilViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+class ProfilViewSet(ProfiledViewMixin, BatchRetrieveMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin,
+                    mixins.DestroyModelMixin, viewsets.GenericViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticatedCustom & IsOwnUserOrAdmin]
@@ -296,8 +365,9 @@ class ProfilViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.D
         return self.update(request, *args, **kwargs)
 
 
-class ProfilTypeViewSet(generics.ListCreateAPIView):
+class ProfilTypeViewSet(ProfiledViewMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticatedCustom & IsSuperUser]
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         user_type = self.kwargs.get('user_type', None)
@@ -307,17 +377,38 @@ class ProfilTypeViewSet(generics.ListCreateAPIView):
             return CustomerUserSerializer
         return BusinessUserSerializer
 
+    @property
+    def keyset_ordering_field(self):
+        """
+        ?ordering=rating sortiert Business-Profile absteigend nach ihrer
+        gespeicherten Durchschnittsbewertung.
+        """
+        if (self.kwargs.get('user_type') == 'business'
+                and self.request.query_params.get('ordering') == 'rating'):
+            return 'average_rating'
+        return None
+
     def get_queryset(self):
         user_type = self.kwargs.get('user_type', None)
-        if user_type in ['business', 'customer']:
+        if user_type == 'business':
+            queryset = CustomUser.objects.filter(type=user_type).select_related(
+                'profile_stats').annotate(average_rating=F('profile_stats__average_rating'))
+            if self.keyset_ordering_field:
+                queryset = queryset.order_by('-average_rating', '-id')
+            return queryset
+        if user_type == 'customer':
             return CustomUser.objects.filter(type=user_type)
         return CustomUser.objects.none()
 
 
-class ReviewsViewSet(viewsets.ModelViewSet):
+class ReviewsViewSet(ProfiledViewMixin, DeltaSyncMixin, ProjectedListMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
+    projection_class = ReviewProjection
     permission_classes = [IsAuthenticatedCustom, IsCustomerUser]
     filterset_class = ReviewFilter
+    pagination_class = KeysetPagination
+    tombstone_kind = 'review'
+    tombstone_filters = {'business_user_id': 'business_user_id', 'reviewer_id': 'user_id'}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -335,7 +426,13 @@ class ReviewsViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(
                 "Forbidden. Ein Benutzer kann nur eine Bewertung pro Geschäftsprofil abgeben.")
 
-        serializer.save(reviewer=reviewer)
+        try:
+            with transaction.atomic():
+                serializer.save(reviewer=reviewer)
+        except IntegrityError:
+            # Gleichzeitig angelegte Bewertung, vom Unique-Constraint abgefangen
+            raise PermissionDenied(
+                "Forbidden. Ein Benutzer kann nur eine Bewertung pro Geschäftsprofil abgeben.")
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -364,17 +461,4 @@ class ReviewsViewSet(viewsets.ModelViewSet):
 class BaseInfoView(viewsets.ViewSet):
 
     def list(self, request, pk=None):
-        review_count = Review.objects.all().count() or 0
-        average_rating = Review.objects.aggregate(
-            Avg('rating'))['rating__avg'] or 0
-        average_rating_rounded = round(Decimal(average_rating), 1)
-        business_profile_count = CustomUser.objects.filter(
-            type='business').count() or 0
-        offer_count = Offer.objects.all().count() or 0
-
-        return Response({
-            "review_count": review_count,
-            "average_rating": average_rating_rounded,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        }, status=status.HTTP_200_OK)
+        return Response(get_base_info(), status=status.HTTP_200_OK)
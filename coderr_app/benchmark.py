@@ -0,0 +1,582 @@
+import asyncio
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from itertools import cycle, islice
+
+import django
+from asgiref.sync import ThreadSensitiveContext
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import AsyncClient, Client, RequestFactory
+from django.test.utils import (CaptureQueriesContext, override_settings, setup_test_environment,
+                               teardown_test_environment)
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .api.renderers import FastJSONRenderer
+from .api.throttling import ReadWriteRateThrottle
+from .caching import (BASE_INFO_CACHE_NAMESPACE, OFFER_CACHE_NAMESPACE, has_atomic_incr,
+                      reset_namespace_versions)
+from .compression import brotli, compress
+from .models import CustomUser, Offer, OfferDetail, Order, Review
+from .search import get_search_backend
+from .stats import reconcile_base_info, reconcile_order_counts, reconcile_rating_stats
+
+
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+OFFER_TYPES = [("basic", 1), ("standard", 2), ("premium", 3)]
+
+BATCH_SIZE = 5_000
+
+BENCHMARK_PASSWORD = "benchmark-pw"
+
+ASYNC_ROUTE_PREFIX = 'async-'
+
+
+def parse_scale(scale):
+    """
+    Wandelt '1k', '100k', '1m' oder eine Zahl in die Anzahl der Datensätze um.
+    """
+    scale = str(scale).lower()
+    if scale in SCALES:
+        return SCALES[scale]
+    return int(scale)
+
+
+def _bulk_create(model, objects):
+    while True:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+
+def seed_dataset(size):
+    """
+    Legt einen synthetischen Datenbestand mit je `size` Angeboten, Bestellungen
+    und Bewertungen an und bringt danach alle abgeleiteten Daten auf Stand.
+
+    Es werden so viele Business- und Kundenprofile angelegt, dass jede
+    Bewertung ein eigenes (business_user, reviewer)-Paar erhält.
+    """
+    profile_count = max(10, math.isqrt(size) + 1)
+    password = make_password(BENCHMARK_PASSWORD)
+
+    _bulk_create(CustomUser, (
+        CustomUser(username=f"{user_type}_{i}", email=f"{user_type}_{i}@example.com",
+                   password=password, type=user_type, first_name="Bench", last_name=str(i))
+        for user_type in ("business", "customer") for i in range(profile_count)
+    ))
+    business_ids = list(CustomUser.objects.filter(
+        type="business").order_by('pk').values_list('pk', flat=True))
+    customer_ids = list(CustomUser.objects.filter(
+        type="customer").order_by('pk').values_list('pk', flat=True))
+
+    _bulk_create(Offer, (
+        Offer(user_id=user_id, title=f"Angebot {i}",
+              description=f"Beschreibung für Angebot {i} mit Logo und Webdesign")
+        for i, user_id in zip(range(size), cycle(business_ids))
+    ))
+    _bulk_create(OfferDetail, (
+        OfferDetail(offer_id=offer_id, user_id=user_id, title=f"{offer_type} {offer_id}",
+                    revisions=factor, delivery_time_in_days=factor * 3,
+                    price=Decimal(50 * factor + offer_id % 100), features=["Feature"],
+                    offer_type=offer_type)
+        for offer_id, user_id in Offer.objects.order_by('pk').values_list('pk', 'user_id').iterator()
+        for offer_type, factor in OFFER_TYPES
+    ))
+    statuses = cycle(["in_progress", "completed", "cancelled"])
+    _bulk_create(Order, (
+        Order(customer_user_id=customer_ids[i % len(customer_ids)],
+              business_user_id=business_ids[i % len(business_ids)],
+              title=f"Bestellung {i}", revisions=1, delivery_time_in_days=3,
+              price=Decimal(100), features=["Feature"], offer_type="basic", status=status)
+        for i, status in zip(range(size), statuses)
+    ))
+    _bulk_create(Review, (
+        Review(business_user_id=business_ids[i % len(business_ids)],
+               reviewer_id=customer_ids[i // len(business_ids)],
+               rating=i % 5 + 1, description=f"Bewertung {i}")
+        for i in range(size)
+    ))
+
+    # bulk_create löst keine Signale aus
+    Offer.objects.refresh_summaries()
+    get_search_backend().rebuild()
+    reconcile_base_info()
+    reconcile_order_counts()
+    reconcile_rating_stats()
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    Ein Request gegen eine benannte Route aus coderr_app/api/urls.py.
+    """
+    name: str
+    url_name: str
+    method: str = 'get'
+    url_kwargs: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    data: object = None
+    user: str = None
+    # Erwarteter Status; jede Abweichung lässt den Benchmark scheitern
+    status: int = 200
+
+
+class BenchmarkFixtures:
+    """
+    Beispielobjekte aus dem Datenbestand, auf die sich die Requests beziehen.
+    """
+
+    def __init__(self):
+        self.business_user, self.logout_user = CustomUser.objects.filter(
+            type="business").order_by('pk')[:2]
+        self.offer = Offer.objects.filter(
+            user=self.business_user).order_by('pk').first()
+        self.detail = self.offer.details.order_by('pk').first()
+        # IDs für die Sammelabrufe, etwa die Nutzer einer Bewertungsseite
+        self.user_ids = ','.join(map(str, CustomUser.objects.order_by(
+            'pk').values_list('pk', flat=True)[:20]))
+        self.detail_ids = ','.join(map(str, OfferDetail.objects.order_by(
+            'pk').values_list('pk', flat=True)[:30]))
+        self.order = Order.objects.filter(
+            business_user=self.business_user).order_by('pk').first()
+        self.customer_user = self.order.customer_user
+        self.review = Review.objects.filter(
+            reviewer=self.customer_user).order_by('pk').first()
+        self.tokens = {
+            'business': Token.objects.get_or_create(user=self.business_user)[0].key,
+            'customer': Token.objects.get_or_create(user=self.customer_user)[0].key,
+        }
+        self.registrations = 0
+        # Abfragezeitpunkt eines Clients, der gerade synchronisiert hat
+        self.delta_since = timezone.now().isoformat()
+
+    def next_registration(self):
+        self.registrations += 1
+        username = f"bench_registration_{self.registrations}_{time.monotonic_ns()}"
+        return {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": BENCHMARK_PASSWORD,
+            "repeated_password": BENCHMARK_PASSWORD,
+            "type": "customer",
+        }
+
+
+RESPONSE_CACHE_NAMESPACES = (OFFER_CACHE_NAMESPACE, BASE_INFO_CACHE_NAMESPACE)
+
+BENCHMARK_THROTTLE_RATES = {'auth': '1000000/s', 'read': '1000000/s', 'write': '1000000/s'}
+
+
+@contextmanager
+def benchmark_database(size, keepdb=False, log=None):
+    """
+    Legt eine separate Test-Datenbank mit `size` Datensätzen an (bzw. nutzt
+    sie mit keepdb weiter) und entfernt sie danach wieder.
+    """
+    if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+        # Dateibasiert statt In-Memory, damit --keepdb möglich ist und
+        # parallele Threads dieselben Daten sehen
+        connection.settings_dict['TEST']['NAME'] = 'benchmark.sqlite3'
+
+    setup_test_environment(debug=False)
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb)
+    # Limits anheben, aber Throttling aktiv lassen, damit sein Aufwand mitgemessen wird
+    throttling = override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': BENCHMARK_THROTTLE_RATES})
+    throttling.enable()
+    # Gecachte Antworten und Zähler stammen aus der normalen Datenbank
+    cache.clear()
+    try:
+        if Offer.objects.count() != size:
+            if log:
+                log(f"Erzeuge Datenbestand mit {size} Datensätzen ...")
+            # Alle Tabellen leeren, ein Teilbestand kollidiert beim Neuanlegen
+            # der Nutzer mit deren eindeutigen Namen
+            call_command('flush', interactive=False, verbosity=0)
+            seed_dataset(size)
+        yield
+    finally:
+        throttling.disable()
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def benchmark_cases(fixtures):
+    business_pk = fixtures.business_user.pk
+    offer_pk = fixtures.offer.pk
+    return [
+        BenchmarkCase('api-root', 'api-root'),
+        BenchmarkCase('offers-list', 'offers-list'),
+        BenchmarkCase('offers-list-filtered', 'offers-list',
+                      params={'min_price': 60, 'max_delivery_time': 5, 'ordering': 'min_price'}),
+        BenchmarkCase('offers-list-creator', 'offers-list',
+                      params={'creator_id': business_pk}),
+        BenchmarkCase('offers-list-search', 'offers-list',
+                      params={'search': 'logo'}),
+        BenchmarkCase('offers-list-cursor', 'offers-list',
+                      params={'cursor': ''}),
+        BenchmarkCase('offers-list-expanded', 'offers-list',
+                      params={'expand': 'details,user'}, user='customer'),
+        BenchmarkCase('offers-list-sparse', 'offers-list',
+                      params={'fields': 'id,title,min_price,image_variants'}),
+        BenchmarkCase('offers-list-delta', 'offers-list',
+                      params={'updated_since': fixtures.delta_since}),
+        BenchmarkCase('offers-detail', 'offers-detail',
+                      url_kwargs={'pk': offer_pk}, user='customer'),
+        BenchmarkCase('offerdetails-detail', 'offerdetails-detail',
+                      url_kwargs={'pk': fixtures.detail.pk}, user='customer'),
+        BenchmarkCase('offerdetails-batch', 'offerdetails-list',
+                      params={'ids': fixtures.detail_ids}, user='customer'),
+        BenchmarkCase('orders-list', 'orders-list', user='customer'),
+        BenchmarkCase('orders-list-cursor', 'orders-list',
+                      params={'cursor': ''}, user='business'),
+        BenchmarkCase('orders-list-delta', 'orders-list',
+                      params={'updated_since': fixtures.delta_since}, user='business'),
+        BenchmarkCase('orders-detail', 'orders-detail',
+                      url_kwargs={'pk': fixtures.order.pk}, user='customer'),
+        BenchmarkCase('order-count-detail', 'order-count-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('completed-order-count-detail', 'completed-order-count-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('order-stats-detail', 'order-stats-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('rating-stats-detail', 'rating-stats-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('profile-detail', 'profile-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('profile-batch', 'profile-list',
+                      params={'ids': fixtures.user_ids}, user='customer'),
+        BenchmarkCase('profiles-business-cursor', 'profilType-detail',
+                      url_kwargs={'user_type': 'business'}, params={'cursor': ''}, user='customer'),
+        BenchmarkCase('profiles-business-rating', 'profilType-detail',
+                      url_kwargs={'user_type': 'business'},
+                      params={'cursor': '', 'ordering': 'rating'}, user='customer'),
+        BenchmarkCase('profiles-customer-cursor', 'profilType-detail',
+                      url_kwargs={'user_type': 'customer'}, params={'cursor': ''}, user='customer'),
+        BenchmarkCase('reviews-list', 'reviews-list',
+                      params={'business_user_id': business_pk}, user='customer'),
+        BenchmarkCase('reviews-list-cursor', 'reviews-list',
+                      params={'cursor': ''}, user='customer'),
+        BenchmarkCase('reviews-list-delta', 'reviews-list',
+                      params={'updated_since': fixtures.delta_since}, user='customer'),
+        BenchmarkCase('reviews-detail', 'reviews-detail',
+                      url_kwargs={'pk': fixtures.review.pk}, user='customer'),
+        BenchmarkCase('base-info-list', 'base-info-list'),
+        BenchmarkCase('async-offers-list', 'async-offers-list'),
+        BenchmarkCase('async-offers-detail', 'async-offers-detail',
+                      url_kwargs={'pk': offer_pk}, user='customer'),
+        BenchmarkCase('async-reviews-list', 'async-reviews-list',
+                      params={'business_user_id': business_pk}, user='customer'),
+        BenchmarkCase('async-base-info-list', 'async-base-info-list'),
+        BenchmarkCase('async-order-count-detail', 'async-order-count-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('async-completed-order-count-detail', 'async-completed-order-count-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('async-order-stats-detail', 'async-order-stats-detail',
+                      url_kwargs={'pk': business_pk}, user='customer'),
+        BenchmarkCase('login-detail', 'login-detail', method='post',
+                      data={'username': fixtures.customer_user.username, 'password': BENCHMARK_PASSWORD}),
+        BenchmarkCase('registration-detail', 'registration-detail', method='post',
+                      data=fixtures.next_registration, status=201),
+        BenchmarkCase('logout-detail', 'logout-detail',
+                      method='post', user='logout', status=204),
+    ]
+
+
+def route_names(urlconf='coderr_app.api.urls'):
+    """
+    Sammelt alle benannten Routen einer URLconf (inkl. Router-Routen).
+    """
+    names = set()
+
+    def collect(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                collect(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.add(pattern.name)
+
+    collect(get_resolver(urlconf).url_patterns)
+    return names
+
+
+def _percentile(values, percentile):
+    ordered = sorted(values)
+    index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _perform(client, fixtures, case):
+    if case.user == 'logout':
+        # Logout löscht das Token, daher pro Durchlauf ein frisches
+        token = Token.objects.get_or_create(user=fixtures.logout_user)[0]
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    elif case.user:
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Token {fixtures.tokens[case.user]}")
+    else:
+        client.credentials()
+
+    data = case.data() if callable(case.data) else case.data
+    url = reverse(case.url_name, kwargs=case.url_kwargs)
+    # Gemessen wird die Berechnung der Antwort, nicht der Treffer im Antwort-Cache
+    reset_namespace_versions(*RESPONSE_CACHE_NAMESPACES)
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        if case.method == 'get':
+            response = client.get(url, case.params)
+        else:
+            response = getattr(client, case.method)(url, data, format='json')
+        duration = time.perf_counter() - start
+    return duration, len(queries.captured_queries), response
+
+
+def measure_throttle_overhead(iterations=1000):
+    """
+    Mittlere Dauer einer Throttle-Prüfung (Lesen + Hochzählen der Zähler im
+    konfigurierten Cache) in Millisekunden.
+    """
+    request = RequestFactory().get('/api/offers/', REMOTE_ADDR='203.0.113.1')
+    request.user = None
+    throttle = ReadWriteRateThrottle()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        throttle.allow_request(request, None)
+    return round((time.perf_counter() - start) / iterations * 1000, 4)
+
+
+def payload_cases(fixtures):
+    return [
+        BenchmarkCase('offers-list', 'offers-list', params={'page_size': 100}),
+        BenchmarkCase('orders-list', 'orders-list',
+                      params={'cursor': '', 'page_size': 100}, user='business'),
+    ]
+
+
+def measure_payloads(client, fixtures, iterations=20):
+    """
+    Vergleicht für große Listenseiten die Renderzeit von DRFs JSONRenderer
+    (stdlib json) und FastJSONRenderer sowie die Antwortgröße unkomprimiert,
+    mit gzip und (falls installiert) mit brotli.
+    """
+    payloads = {}
+    for case in payload_cases(fixtures):
+        data = _perform(client, fixtures, case)[2].data
+        result = {}
+        for name, renderer in (('stdlib', JSONRenderer()), ('fast', FastJSONRenderer())):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                body = renderer.render(data)
+            result[f'{name}_render_ms'] = round((time.perf_counter() - start) / iterations * 1000, 3)
+        result['bytes'] = len(body)
+        result['gzip_bytes'] = len(compress(body, 'gzip'))
+        if brotli is not None:
+            result['br_bytes'] = len(compress(body, 'br'))
+        payloads[case.name] = result
+    return payloads
+
+
+def run_benchmark(iterations=20, warmup=2):
+    """
+    Führt jeden BenchmarkCase aus und misst Abfrageanzahl, Latenz und Speicher.
+
+    Gibt einen JSON-serialisierbaren Bericht zurück; fehlende Routen aus
+    coderr_app/api/urls.py werden unter 'uncovered_routes' gemeldet.
+    """
+    fixtures = BenchmarkFixtures()
+    cases = benchmark_cases(fixtures)
+    client = APIClient()
+    endpoints = {}
+    # Vor den Endpunkten messen: der lokale Dateicache durchsucht bei jedem
+    # set das Verzeichnis, mit vielen Einträgen würde das den Wert verfälschen
+    throttle_overhead_ms = measure_throttle_overhead()
+
+    for case in cases:
+        for _ in range(warmup):
+            _perform(client, fixtures, case)
+
+        durations, query_counts = [], []
+        for _ in range(iterations):
+            duration, query_count, response = _perform(client, fixtures, case)
+            durations.append(duration)
+            query_counts.append(query_count)
+
+        tracemalloc.start()
+        try:
+            _perform(client, fixtures, case)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        endpoints[case.name] = {
+            'route': case.url_name,
+            'method': case.method.upper(),
+            'status': response.status_code,
+            'expected_status': case.status,
+            'queries': max(query_counts),
+            'p50_ms': round(statistics.median(durations) * 1000, 3),
+            'p95_ms': round(_percentile(durations, 95) * 1000, 3),
+            'peak_memory_kb': round(peak_memory / 1024, 1),
+        }
+
+    covered = {case.url_name for case in cases}
+    return {
+        'iterations': iterations,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'endpoints': endpoints,
+        'throttle_overhead_ms': throttle_overhead_ms,
+        # 'database', wenn der Cache kein atomares incr hat (siehe throttling.py)
+        'throttle_store': 'cache' if has_atomic_incr() else 'database',
+        'payloads': measure_payloads(client, fixtures, iterations),
+        'uncovered_routes': sorted(route_names() - covered),
+    }
+
+
+def check_report(report, baseline=None, max_regression=0.25, max_queries=None, max_p95_ms=None,
+                 max_throttle_ms=None):
+    """
+    Vergleicht einen Bericht mit Grenzwerten und optional einer Baseline.
+
+    Gibt eine Liste lesbarer Verstöße zurück (leer = bestanden). Gegenüber
+    der Baseline darf die Abfrageanzahl nicht steigen und p95 höchstens um
+    max_regression (relativ, mindestens 1 ms absolut) wachsen.
+    """
+    failures = [f"Route ohne Benchmark: {name}" for name in report['uncovered_routes']]
+    throttle_ms = report.get('throttle_overhead_ms')
+    if max_throttle_ms is not None and throttle_ms is not None and throttle_ms > max_throttle_ms:
+        failures.append(
+            f"Throttling: {throttle_ms} ms pro Request > Grenzwert {max_throttle_ms} ms")
+
+    for name, result in report['endpoints'].items():
+        expected = result.get('expected_status', 200)
+        if result['status'] != expected:
+            failures.append(f"{name}: Status {result['status']}, erwartet {expected}")
+        if max_queries is not None and result['queries'] > max_queries:
+            failures.append(
+                f"{name}: {result['queries']} Abfragen > Grenzwert {max_queries}")
+        if max_p95_ms is not None and result['p95_ms'] > max_p95_ms:
+            failures.append(
+                f"{name}: p95 {result['p95_ms']} ms > Grenzwert {max_p95_ms} ms")
+
+        reference = (baseline or {}).get('endpoints', {}).get(name)
+        if reference is None:
+            continue
+        if result['queries'] > reference['queries']:
+            failures.append(
+                f"{name}: {result['queries']} Abfragen, Baseline {reference['queries']}")
+        allowed_p95 = max(reference['p95_ms'] * (1 + max_regression),
+                          reference['p95_ms'] + 1)
+        if result['p95_ms'] > allowed_p95:
+            failures.append(
+                f"{name}: p95 {result['p95_ms']} ms, Baseline {reference['p95_ms']} ms")
+
+    return failures
+
+
+def _summarize(durations, wall_time):
+    return {
+        'requests': len(durations),
+        'throughput_rps': round(len(durations) / wall_time, 1),
+        'p50_ms': round(statistics.median(durations) * 1000, 3),
+        'p95_ms': round(_percentile(durations, 95) * 1000, 3),
+    }
+
+
+def _run_wsgi(case, url, headers, concurrency, requests_per_client):
+    def client_loop():
+        client = Client()
+        durations = []
+        try:
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                client.get(url, case.params, headers=headers)
+                durations.append(time.perf_counter() - start)
+        finally:
+            connections.close_all()
+        return durations
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(client_loop) for _ in range(concurrency)]
+        durations = [duration for future in futures for duration in future.result()]
+    return _summarize(durations, time.perf_counter() - start)
+
+
+def _run_asgi(case, url, headers, concurrency, requests_per_client):
+    async def client_loop():
+        client = AsyncClient()
+        durations = []
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            # Wie ASGIHandler: eigener Thread für sync-Code pro Request
+            async with ThreadSensitiveContext():
+                await client.get(url, case.params, headers=headers)
+            durations.append(time.perf_counter() - start)
+        return durations
+
+    async def run_clients():
+        return await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    durations = [duration for client in asyncio.run(run_clients()) for duration in client]
+    return _summarize(durations, time.perf_counter() - start)
+
+
+def run_concurrency_benchmark(concurrency=50, requests_per_client=10):
+    """
+    Vergleicht den Durchsatz der sync-Routen unter WSGI mit ihren
+    async-Varianten unter ASGI bei vielen gleichzeitigen Clients.
+
+    WSGI: ein Thread pro Client (wie ein Thread-Worker-Server), ASGI: alle
+    Clients in einem Event-Loop. Beide laufen im Prozess über die
+    Django-Testclients, gemessen wird also der Handler ohne Netzwerk.
+    """
+    fixtures = BenchmarkFixtures()
+    endpoints = {}
+    for case in benchmark_cases(fixtures):
+        if not case.url_name.startswith(ASYNC_ROUTE_PREFIX):
+            continue
+        sync_case = replace(case, url_name=case.url_name[len(ASYNC_ROUTE_PREFIX):])
+        headers = {'Authorization': f"Token {fixtures.tokens[case.user]}"} if case.user else {}
+
+        endpoints[sync_case.url_name] = {
+            'wsgi': _run_wsgi(sync_case, reverse(sync_case.url_name, kwargs=case.url_kwargs),
+                              headers, concurrency, requests_per_client),
+            'asgi': _run_asgi(case, reverse(case.url_name, kwargs=case.url_kwargs),
+                              headers, concurrency, requests_per_client),
+        }
+
+    return {
+        'concurrency': concurrency,
+        'requests_per_client': requests_per_client,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'endpoints': endpoints,
+    }
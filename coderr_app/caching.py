@@ -0,0 +1,217 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import transaction
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur der prozessinterne Schutz über _IN_FLIGHT
+    fcntl = None
+
+from .db_router import use_primary
+
+
+OFFER_CACHE_NAMESPACE = 'offers'
+BASE_INFO_CACHE_NAMESPACE = 'base-info'
+
+# Laufende Berechnungen dieses Prozesses: Schlüssel -> Event für wartende Threads
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+# Anzahl Lock-Dateien im Dateicache; Lock-Namen werden per Hash verteilt
+FILE_LOCK_STRIPES = 256
+
+
+def _version_key(namespace):
+    return f'coderr:version:{namespace}'
+
+
+def get_namespace_version(namespace):
+    """
+    Liefert (version, last_modified) eines Cache-Namensraums.
+
+    Fehlt der Eintrag (z. B. nach Eviction), wird eine neue, zeitbasierte
+    Version angelegt, sodass nie alte Einträge wiederverwendet werden.
+    """
+    state = cache.get(_version_key(namespace))
+    if state is None:
+        cache.add(_version_key(namespace),
+                  (time.time_ns(), timezone.now()), None)
+        state = cache.get(_version_key(namespace))
+    return state
+
+
+def bump_namespace_version(namespace, last_modified=None):
+    """
+    Invalidiert alle Einträge eines Namensraums nach dem Commit der Transaktion.
+    """
+    def bump():
+        cache.set(_version_key(namespace),
+                  (time.time_ns(), last_modified or timezone.now()), None)
+
+    transaction.on_commit(bump)
+
+
+def reset_namespace_versions(*namespaces):
+    """
+    Verwirft die Versionen sofort statt nach dem Commit, etwa damit
+    Messungen jede Antwort neu berechnen.
+    """
+    cache.delete_many([_version_key(namespace) for namespace in namespaces])
+
+
+def namespaced_key(namespace, *parts, version=None):
+    """
+    Baut einen Schlüssel 'coderr:<namespace>:<version>:<parts>'.
+
+    Durch die eingebettete Version werden mit bump_namespace_version alle
+    Schlüssel eines Namensraums auf einmal ungültig.
+    """
+    if version is None:
+        version = get_namespace_version(namespace)[0]
+    return ":".join(['coderr', namespace, str(version), *map(str, parts)])
+
+
+def has_atomic_add():
+    """
+    FileBasedCache.add prüft und schreibt in zwei Schritten und eignet sich
+    daher nicht als prozessübergreifender Lock.
+    """
+    return not isinstance(caches['default'], FileBasedCache)
+
+
+def has_atomic_incr():
+    """
+    Datei- und Datenbankcache erhöhen per get und set; das ist nicht atomar
+    und setzt den Ablauf auf den Standardwert zurück.
+    """
+    return not isinstance(caches['default'], (FileBasedCache, DatabaseCache))
+
+
+def acquire_lock(name, timeout):
+    """
+    Versucht einen prozessübergreifenden Lock zu setzen und liefert dann ein
+    Token für release_lock, sonst None.
+
+    Über cache.add, wenn der Cache das atomar kann (Redis, Memcached,
+    Datenbank). Beim Dateicache per flock auf eine von FILE_LOCK_STRIPES
+    Lock-Dateien im Cache-Verzeichnis; das Betriebssystem gibt den Lock
+    beim Ende des Prozesses frei, timeout entfällt daher. Ohne fcntl
+    (Windows) gibt es keinen prozessübergreifenden Lock.
+    """
+    if has_atomic_add():
+        token = uuid.uuid4().hex
+        return token if cache.add(name, token, timeout) else None
+    if fcntl is None:
+        return True
+
+    # clear() und das Culling des Dateicaches betreffen nur *.djcache-Dateien
+    directory = os.path.join(caches['default']._dir, 'locks')
+    os.makedirs(directory, exist_ok=True)
+    stripe = int(hashlib.sha256(name.encode()).hexdigest()[:8], 16) % FILE_LOCK_STRIPES
+    lock_file = open(os.path.join(directory, f'{stripe}.lock'), 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def release_lock(name, token):
+    if has_atomic_add():
+        if cache.get(name) == token:
+            cache.delete(name)
+    elif fcntl is not None:
+        # Schließen hebt den flock auf
+        token.close()
+
+
+def get_or_compute(key, compute, timeout, changed_ns=None):
+    """
+    Liest key aus dem Cache oder berechnet ihn mit Single-Flight-Schutz.
+
+    Bei einem Cache-Miss berechnet pro Schlüssel nur ein Aufrufer den Wert:
+    innerhalb des Prozesses warten weitere Threads auf ein Event des
+    Schlüssels, prozessübergreifend schützt acquire_lock. Andere Aufrufer
+    warten bis zu CACHE_LOCK_WAIT Sekunden auf das Ergebnis oder den Lock
+    und berechnen erst danach ohne Lock selbst. Gibt compute None zurück,
+    wird nichts gespeichert.
+
+    compute liest wie jeder Request von einem Replikat. Nur bis
+    REPLICA_PIN_SECONDS nach der letzten Änderung (changed_ns, die
+    zeitbasierte Namensraum-Version) liest es von der primären Datenbank,
+    damit kein Replikat-Rückstand im Cache landet.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    # Der globale Lock schützt nur das Register, nie Berechnung oder Warten
+    with _IN_FLIGHT_LOCK:
+        event = _IN_FLIGHT.get(key)
+        is_leader = event is None
+        if is_leader:
+            event = _IN_FLIGHT[key] = threading.Event()
+
+    if not is_leader:
+        event.wait(settings.CACHE_LOCK_WAIT)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        return _compute_and_store(key, compute, timeout, changed_ns)
+
+    try:
+        return _compute_with_lock(key, compute, timeout, changed_ns)
+    finally:
+        with _IN_FLIGHT_LOCK:
+            del _IN_FLIGHT[key]
+        event.set()
+
+
+def _compute_with_lock(key, compute, timeout, changed_ns):
+    lock_name = f'{key}:lock'
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while True:
+        token = acquire_lock(lock_name, settings.CACHE_LOCK_TIMEOUT)
+        if token is not None:
+            break
+        if time.monotonic() >= deadline:
+            return _compute_and_store(key, compute, timeout, changed_ns)
+        # Der Lock kann auch von einem anderen Schlüssel derselben
+        # Lock-Datei gehalten werden, daher erneut versuchen statt nur zu warten
+        time.sleep(0.02)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    try:
+        # Ein anderer Worker kann den Wert inzwischen gespeichert haben
+        value = cache.get(key)
+        if value is not None:
+            return value
+        return _compute_and_store(key, compute, timeout, changed_ns)
+    finally:
+        release_lock(lock_name, token)
+
+
+def _compute_and_store(key, compute, timeout, changed_ns):
+    pinned = (changed_ns is not None
+              and time.time_ns() - changed_ns < settings.REPLICA_PIN_SECONDS * 1_000_000_000)
+    if pinned:
+        with use_primary():
+            value = compute()
+    else:
+        value = compute()
+    if value is not None:
+        cache.set(key, value, timeout)
+    return value
+
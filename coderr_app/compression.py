@@ -0,0 +1,98 @@
+import gzip
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+_ACCEPT_ENCODING = re.compile(r'([\w*-]+)\s*(?:;\s*q\s*=\s*(\S+))?')
+
+COMPRESSIBLE_TYPES = re.compile(r'^(text/|application/(.+\+)?(json|javascript|xml))')
+
+
+def accepted_encodings(header):
+    """
+    Wandelt einen Accept-Encoding-Header in {kodierung: q-wert} um.
+    """
+    encodings = {}
+    for part in header.lower().split(','):
+        match = _ACCEPT_ENCODING.fullmatch(part.strip())
+        if match:
+            try:
+                encodings[match.group(1)] = float(match.group(2) or 1)
+            except ValueError:
+                continue
+    return encodings
+
+
+def compress(content, encoding):
+    config = settings.RESPONSE_COMPRESSION
+    if encoding == 'br':
+        return brotli.compress(content, quality=config['BROTLI_QUALITY'])
+    return gzip.compress(content, compresslevel=config['GZIP_LEVEL'], mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Komprimiert Text- und JSON-Antworten ab settings.RESPONSE_COMPRESSION['MIN_SIZE']
+    Bytes per brotli (falls installiert) oder gzip, je nach Accept-Encoding.
+
+    Kleinere Antworten bleiben unkomprimiert, da der Overhead dort den Gewinn
+    übersteigt; starke ETags werden wie bei Djangos GZipMiddleware abgeschwächt.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def choose_encoding(self, request):
+        """
+        Wählt die unterstützte Kodierung mit dem höchsten q-Wert; bei
+        Gleichstand wird brotli bevorzugt.
+        """
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        best, best_q = None, 0
+        for encoding in ('br', 'gzip') if brotli is not None else ('gzip',):
+            q = accepted.get(encoding, accepted.get('*', 0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def process_response(self, request, response):
+        if (response.streaming or response.has_header('Content-Encoding')
+                or not COMPRESSIBLE_TYPES.match(response.get('Content-Type', ''))
+                or len(response.content) < settings.RESPONSE_COMPRESSION['MIN_SIZE']):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,118 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+
+PRIMARY_DATABASE = 'default'
+PRIMARY_PIN_COOKIE = 'coderr_primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_from_replica = ContextVar('coderr_read_from_replica', default=False)
+
+
+@contextmanager
+def use_primary():
+    """
+    Leitet Lesezugriffe innerhalb des Blocks auf die primäre Datenbank um,
+    z. B. beim Befüllen von Caches, die keine veralteten Daten enthalten dürfen.
+    """
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Verteilt Lesezugriffe auf settings.REPLICA_DATABASES, sofern der aktuelle
+    Request von ReplicaRoutingMiddleware dafür freigegeben wurde.
+
+    Schreibzugriffe (inkl. select_for_update und get_or_create) gehen immer
+    an die primäre Datenbank.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.REPLICA_DATABASES and _read_from_replica.get():
+            return random.choice(settings.REPLICA_DATABASES)
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_DATABASE, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def _pin_key(request):
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return f'coderr:primary-pin:{digest}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Gibt lesende Requests (GET/HEAD/OPTIONS) für die Replikate frei.
+
+    Nach einem erfolgreichen schreibenden Request wird der Client für
+    settings.REPLICA_PIN_SECONDS auf die primäre Datenbank festgelegt
+    (read-your-writes): per Cookie und, für Token-Clients ohne Cookies,
+    per Eintrag im gemeinsamen Cache.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _read_from_replica.set(self.use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        self.pin_after_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_from_replica.set(self.use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        self.pin_after_write(request, response)
+        return response
+
+    def use_replica(self, request):
+        if not settings.REPLICA_DATABASES or request.method not in SAFE_METHODS:
+            return False
+        if PRIMARY_PIN_COOKIE in request.COOKIES:
+            return False
+        pin_key = _pin_key(request)
+        return pin_key is None or cache.get(pin_key) is None
+
+    def pin_after_write(self, request, response):
+        if (not settings.REPLICA_DATABASES or request.method in SAFE_METHODS
+                or response.status_code >= 400):
+            return
+        response.set_cookie(PRIMARY_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                            httponly=True, samesite='Lax')
+        pin_key = _pin_key(request)
+        if pin_key is not None:
+            cache.set(pin_key, True, settings.REPLICA_PIN_SECONDS)
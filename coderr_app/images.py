@@ -0,0 +1,147 @@
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.dispatch import Signal
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .tasks import enqueue, task
+
+
+# MPO: JPEG mit weiteren Bildern (Tiefenkarte, Vorschau), typisch für Handyfotos
+ALLOWED_FORMATS = {'JPEG', 'MPO', 'PNG', 'WEBP', 'GIF'}
+
+METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'icc_profile', 'comment')
+
+# Format -> (Dateiendung, Speicheroptionen) der erzeugten Varianten
+VARIANT_FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Wird nach dem Speichern neuer Varianten gesendet (sender=Modell, pk=...)
+variants_updated = Signal()
+
+
+def validate_image(file):
+    """
+    Prüft, ob eine hochgeladene Datei ein unterstütztes, unbeschädigtes Bild ist.
+    """
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            image_format = image.format
+            image.verify()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError('Die Datei ist kein gültiges Bild.')
+    finally:
+        file.seek(0)
+    if image_format not in ALLOWED_FORMATS:
+        raise ValidationError(
+            f'Bildformat {image_format} wird nicht unterstützt.')
+
+
+def _encode(image, options):
+    output = BytesIO()
+    # Ohne exif/icc-Parameter schreibt Pillow keine Metadaten mit
+    image.save(output, **options)
+    return output.getvalue()
+
+
+def _variant_name(name, width, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', f'{stem}_{width}.{extension}')
+
+
+def build_variants(field_file):
+    """
+    Entfernt die Metadaten des Originals und erzeugt verkleinerte WebP/JPEG-
+    Varianten in den Breiten aus settings.IMAGE_VARIANT_WIDTHS.
+
+    Gibt {breite: {format: speichername}} zurück; Breiten größer als das
+    Original werden übersprungen.
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name) as source:
+        with Image.open(source) as image:
+            # Von MPO wird nur das erste Bild als normales JPEG verwendet
+            image_format = 'JPEG' if image.format == 'MPO' else image.format
+            has_metadata = bool(image.getexif()) or any(
+                key in image.info for key in METADATA_KEYS)
+            # EXIF-Ausrichtung anwenden, bevor die Metadaten wegfallen
+            image = ImageOps.exif_transpose(image)
+            image.load()
+
+    if image_format in ('JPEG', 'WEBP'):
+        original = image.convert('RGB')
+    else:
+        original = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    # Nur neu kodieren, wenn nötig, um Qualitätsverluste bei erneuten Läufen
+    # zu vermeiden; GIFs bleiben unverändert, da sonst Animationen verloren gehen
+    if has_metadata and image_format != 'GIF':
+        options = {'format': image_format}
+        if image_format in ('JPEG', 'WEBP'):
+            options['quality'] = 95
+        storage.delete(field_file.name)
+        storage.save(field_file.name, ContentFile(_encode(original, options)))
+
+    rgb = original.convert('RGB')
+    variants = {}
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        if width >= rgb.width:
+            continue
+        height = round(rgb.height * width / rgb.width)
+        resized = rgb.resize((width, height), Image.LANCZOS)
+        variants[str(width)] = {
+            variant_format: storage.save(
+                _variant_name(field_file.name, width, extension),
+                ContentFile(_encode(resized, options)))
+            for variant_format, (extension, options) in VARIANT_FORMATS.items()
+        }
+    return variants
+
+
+def delete_variants(storage, variants):
+    for formats in (variants or {}).values():
+        for name in formats.values():
+            storage.delete(name)
+
+
+def process_image(model, pk, field_name, variants_field):
+    """
+    Erzeugt die Varianten für das aktuelle Bild eines Datensatzes und
+    speichert sie, sofern das Bild in der Zwischenzeit nicht ersetzt wurde.
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return False
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return False
+
+    variants = build_variants(field_file)
+    updated = model.objects.filter(**{'pk': pk, field_name: field_file.name}).update(
+        **{variants_field: variants})
+    if updated:
+        delete_variants(field_file.storage, getattr(instance, variants_field))
+        variants_updated.send(sender=model, pk=pk)
+    else:
+        delete_variants(field_file.storage, variants)
+    return bool(updated)
+
+
+@task
+def generate_image_variants(model_label, pk, field_name, variants_field):
+    process_image(apps.get_model(model_label), pk, field_name, variants_field)
+
+
+def schedule_image_processing(model, pk, field_name, variants_field):
+    """
+    Reiht die Bildverarbeitung in die Aufgaben-Warteschlange ein, damit der
+    Upload-Request nicht auf Pillow wartet.
+    """
+    enqueue(generate_image_variants, model._meta.label, pk, field_name, variants_field)
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coderr_app.benchmark import benchmark_database, check_report, parse_scale, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Misst Abfrageanzahl, Latenz (p50/p95) und Speicher aller API-Routen "
+        "gegen einen synthetischen Datenbestand in einer separaten Test-Datenbank."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='1k',
+                            help="Anzahl Angebote/Bestellungen/Bewertungen: 1k, 100k, 1m oder eine Zahl.")
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--output', help="Bericht als JSON in diese Datei schreiben.")
+        parser.add_argument('--baseline', help="Früheren Bericht als Vergleichsbasis verwenden.")
+        parser.add_argument('--max-regression', type=float, default=0.25,
+                            help="Erlaubter relativer p95-Anstieg gegenüber der Baseline.")
+        parser.add_argument('--max-queries', type=float,
+                            help="Maximale Abfragen pro Request für jede Route.")
+        parser.add_argument('--max-p95-ms', type=float,
+                            help="Maximale p95-Latenz in ms für jede Route.")
+        parser.add_argument('--max-throttle-ms', type=float, default=0.5,
+                            help="Maximaler Aufwand der Throttle-Prüfung pro Request in ms.")
+        parser.add_argument('--keepdb', action='store_true',
+                            help="Test-Datenbank (samt Daten) für weitere Läufe behalten.")
+
+    def handle(self, *args, **options):
+        size = parse_scale(options['scale'])
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        with benchmark_database(size, keepdb=options['keepdb'], log=self.stderr.write):
+            report = run_benchmark(iterations=options['iterations'])
+
+        report['scale'] = size
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        else:
+            self.stdout.write(output)
+
+        failures = check_report(
+            report, baseline=baseline, max_regression=options['max_regression'],
+            max_queries=options['max_queries'], max_p95_ms=options['max_p95_ms'],
+            max_throttle_ms=options['max_throttle_ms'])
+        if failures:
+            raise CommandError("Benchmark fehlgeschlagen:\n" + "\n".join(failures))
+        self.stderr.write(self.style.SUCCESS("Benchmark bestanden."))
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from coderr_app.benchmark import benchmark_database, parse_scale, run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergleicht den Durchsatz der lesenden Endpunkte unter WSGI (sync-Views) "
+        "und ASGI (async-Views) bei vielen gleichzeitigen Clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='1k',
+                            help="Anzahl Angebote/Bestellungen/Bewertungen: 1k, 100k, 1m oder eine Zahl.")
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help="Anzahl gleichzeitiger Clients.")
+        parser.add_argument('--requests', type=int, default=10,
+                            help="Requests pro Client und Endpunkt.")
+        parser.add_argument('--output', help="Bericht als JSON in diese Datei schreiben.")
+        parser.add_argument('--keepdb', action='store_true',
+                            help="Test-Datenbank (samt Daten) für weitere Läufe behalten.")
+
+    def handle(self, *args, **options):
+        size = parse_scale(options['scale'])
+        with benchmark_database(size, keepdb=options['keepdb'], log=self.stderr.write):
+            report = run_concurrency_benchmark(
+                concurrency=options['concurrency'], requests_per_client=options['requests'])
+
+        report['scale'] = size
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output)
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.images import process_image
+from coderr_app.models import CustomUser, Offer
+
+
+class Command(BaseCommand):
+    help = "Erzeugt fehlende Bildvarianten für Angebots- und Profilbilder (mit --all alle neu)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help="Auch Bilder mit vorhandenen Varianten neu verarbeiten.")
+
+    def handle(self, *args, **options):
+        for model, field_name, variants_field in [
+            (Offer, 'image', 'image_variants'),
+            (CustomUser, 'file', 'file_variants'),
+        ]:
+            queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            if not options['all']:
+                queryset = queryset.filter(**{variants_field: {}})
+
+            processed = 0
+            for pk in queryset.values_list('pk', flat=True).iterator():
+                processed += process_image(model, pk, field_name, variants_field)
+            self.stdout.write(f"{model.__name__}: {processed} Bilder verarbeitet.")
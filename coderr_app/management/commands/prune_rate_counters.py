@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.api.throttling import prune_rate_counters
+
+
+class Command(BaseCommand):
+    help = "Entfernt abgelaufene Zähler der Ratenbegrenzung (nur Datei- und Datenbankcache)."
+
+    def handle(self, *args, **options):
+        deleted = prune_rate_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} abgelaufene Zähler entfernt."))
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from coderr_app.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Entfernt Löschvermerke, die älter als DELTA_SYNC['TOMBSTONE_RETENTION_DAYS'] sind."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.DELTA_SYNC['TOMBSTONE_RETENTION_DAYS'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} Löschvermerke entfernt."))
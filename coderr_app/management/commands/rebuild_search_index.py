@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Baut den Suchindex für Angebote vollständig neu auf."
+
+    def handle(self, *args, **options):
+        indexed = get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"{indexed} Angebote indexiert."))
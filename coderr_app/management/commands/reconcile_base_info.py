@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.stats import reconcile_base_info
+
+
+class Command(BaseCommand):
+    help = "Berechnet die Plattform-Statistik (BaseInfo) neu und meldet Abweichungen."
+
+    def handle(self, *args, **options):
+        drift = reconcile_base_info()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS(
+                "BaseInfo ist aktuell."))
+            return
+
+        for field, (stored, actual) in drift.items():
+            self.stdout.write(self.style.WARNING(
+                f"{field}: gespeichert {stored}, tatsächlich {actual}"))
+        self.stdout.write(self.style.SUCCESS("BaseInfo korrigiert."))
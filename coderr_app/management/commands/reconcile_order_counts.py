@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.stats import reconcile_order_counts
+
+
+class Command(BaseCommand):
+    help = "Berechnet die Bestellzähler aller Business-Profile neu."
+
+    def handle(self, *args, **options):
+        corrected = reconcile_order_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"{corrected} Business-Profile korrigiert."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from coderr_app.stats import reconcile_rating_stats
+
+
+class Command(BaseCommand):
+    help = "Berechnet die Bewertungszähler aller Business-Profile neu."
+
+    def handle(self, *args, **options):
+        corrected = reconcile_rating_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"{corrected} Business-Profile korrigiert."))
@@ -0,0 +1,34 @@
+import os
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from coderr_app.tasks import run_pending_tasks, work
+
+
+class Command(BaseCommand):
+    help = "Führt Aufgaben aus der Warteschlange in einem Prozess-Pool aus."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help="Anzahl Worker-Prozesse (Standard: Anzahl CPUs).")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Sekunden zwischen Abfragen bei leerer Warteschlange.")
+        parser.add_argument('--once', action='store_true',
+                            help="Alle fälligen Aufgaben im aktuellen Prozess ausführen und beenden.")
+
+    def handle(self, *args, **options):
+        if options['once']:
+            results = run_pending_tasks()
+            self.stdout.write(
+                f"{len(results)} Aufgaben ausgeführt, {results.count('failed')} endgültig fehlgeschlagen.")
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        self.stderr.write(f"Worker gestartet ({options['processes']} Prozesse).")
+        work(options['processes'], options['poll_interval'], stop)
+        self.stderr.write("Worker beendet.")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from coderr_app.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Berechnet min_price und min_delivery_time aller Angebote neu oder prüft sie."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Nur prüfen und abweichende Angebote melden, nichts schreiben.",
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            updated = Offer.objects.refresh_summaries()
+            self.stdout.write(self.style.SUCCESS(
+                f"{updated} Angebote aktualisiert."))
+            return
+
+        offers = Offer.objects.annotate(
+            actual_min_price=Min('details__price'),
+            actual_min_delivery_time=Min('details__delivery_time_in_days'),
+        ).values_list('pk', 'min_price', 'actual_min_price',
+                      'min_delivery_time', 'actual_min_delivery_time')
+
+        mismatched = [
+            pk for pk, min_price, actual_min_price, min_delivery_time, actual_min_delivery_time
+            in offers.iterator(chunk_size=2000)
+            if min_price != actual_min_price or min_delivery_time != actual_min_delivery_time
+        ]
+
+        if mismatched:
+            raise CommandError(
+                f"{len(mismatched)} Angebote mit veralteter Zusammenfassung: "
+                f"{', '.join(str(pk) for pk in mismatched[:20])}")
+
+        self.stdout.write(self.style.SUCCESS(
+            "Alle Zusammenfassungen sind aktuell."))
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_offer_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS coderr_app_offer_fts "
+        "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO coderr_app_offer_fts (rowid, title, description) "
+        "SELECT id, title, description FROM coderr_app_offer"
+    )
+
+
+def drop_offer_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS coderr_app_offer_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0006_offer_summary_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_offer_search_index,
+                             drop_offer_search_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:33
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_base_info(apps, schema_editor):
+    BaseInfo = apps.get_model('coderr_app', 'BaseInfo')
+    Review = apps.get_model('coderr_app', 'Review')
+    Offer = apps.get_model('coderr_app', 'Offer')
+    CustomUser = apps.get_model('coderr_app', 'CustomUser')
+    BaseInfo.objects.exclude(pk=1).delete()
+    BaseInfo.objects.update_or_create(pk=1, defaults={
+        'review_count': Review.objects.count(),
+        'rating_sum': Review.objects.aggregate(total=Sum('rating'))['total'] or 0,
+        'business_profile_count': CustomUser.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0007_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='baseinfo',
+            name='average_rating',
+        ),
+        migrations.AddField(
+            model_name='baseinfo',
+            name='rating_sum',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='baseinfo',
+            name='business_profile_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='baseinfo',
+            name='offer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='baseinfo',
+            name='review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_base_info, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_business_profile_stats(apps, schema_editor):
+    BusinessProfileStats = apps.get_model('coderr_app', 'BusinessProfileStats')
+    Order = apps.get_model('coderr_app', 'Order')
+    counts = {}
+    rows = Order.objects.filter(business_user__isnull=False, status__isnull=False).values(
+        'business_user', 'status').annotate(total=Count('id')).order_by()
+    for row in rows:
+        stats = counts.setdefault(
+            row['business_user'], BusinessProfileStats(user_id=row['business_user']))
+        setattr(stats, f"{row['status']}_count", row['total'])
+    BusinessProfileStats.objects.bulk_create(counts.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0008_base_info_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessProfileStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_business_profile_stats,
+                             migrations.RunPython.noop),
+    ]
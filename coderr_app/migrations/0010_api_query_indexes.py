@@ -0,0 +1,75 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:35
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum
+
+
+def remove_duplicates(apps, schema_editor):
+    # Vor den Unique-Constraints jeweils nur den neuesten Eintrag behalten
+    affected = {}
+    for model_name, fields in (('OfferDetail', ('offer', 'offer_type')),
+                               ('Review', ('business_user', 'reviewer'))):
+        model = apps.get_model('coderr_app', model_name)
+        duplicates = model.objects.values(*fields).annotate(
+            newest=Max('id'), total=Count('id')).filter(total__gt=1).order_by()
+        for duplicate in duplicates:
+            deleted, _ = model.objects.filter(**{field: duplicate[field] for field in fields}).exclude(
+                pk=duplicate['newest']).delete()
+            if deleted:
+                affected.setdefault(model_name, set()).add(duplicate[fields[0]])
+
+    # Signale laufen in Migrationen nicht, abgeleitete Werte daher neu berechnen
+    if 'OfferDetail' in affected:
+        Offer = apps.get_model('coderr_app', 'Offer')
+        OfferDetail = apps.get_model('coderr_app', 'OfferDetail')
+        details = OfferDetail.objects.filter(
+            offer=OuterRef('pk')).order_by().values('offer')
+        Offer.objects.filter(pk__in=affected['OfferDetail']).update(
+            min_price=Subquery(
+                details.annotate(value=Min('price')).values('value')),
+            min_delivery_time=Subquery(
+                details.annotate(value=Min('delivery_time_in_days')).values('value')),
+        )
+    if 'Review' in affected:
+        BaseInfo = apps.get_model('coderr_app', 'BaseInfo')
+        Review = apps.get_model('coderr_app', 'Review')
+        BaseInfo.objects.filter(pk=1).update(
+            review_count=Review.objects.count(),
+            rating_sum=Review.objects.aggregate(total=Sum('rating'))['total'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('coderr_app', '0009_business_profile_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['type'], name='user_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', '-updated_at'], name='offer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'status'], name='order_customer_status_idx'),
+        ),
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='offerdetail',
+            constraint=models.UniqueConstraint(fields=('offer', 'offer_type'), name='unique_offer_type_per_offer'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('business_user', 'reviewer'), name='unique_review_per_business_user'),
+        ),
+    ]
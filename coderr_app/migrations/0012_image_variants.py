@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:57
+
+import coderr_app.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0011_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='file',
+            field=models.FileField(blank=True, null=True, upload_to='profile_pictures/', validators=[coderr_app.images.validate_image]),
+        ),
+        migrations.AlterField(
+            model_name='offer',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to='offer_images/', validators=[coderr_app.images.validate_image]),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:06
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_rating_stats(apps, schema_editor):
+    BusinessProfileStats = apps.get_model('coderr_app', 'BusinessProfileStats')
+    CustomUser = apps.get_model('coderr_app', 'CustomUser')
+    Review = apps.get_model('coderr_app', 'Review')
+    # Jedes Business-Profil erhält eine Zeile, damit nach Bewertung sortiert werden kann
+    existing = set(BusinessProfileStats.objects.values_list('user_id', flat=True))
+    BusinessProfileStats.objects.bulk_create(
+        BusinessProfileStats(user_id=pk)
+        for pk in CustomUser.objects.filter(type='business').values_list('pk', flat=True)
+        if pk not in existing)
+
+    rows = Review.objects.values('business_user', 'rating').annotate(
+        total=Count('id')).order_by()
+    stats = {}
+    for row in rows:
+        counts = stats.setdefault(row['business_user'], {})
+        counts[row['rating']] = row['total']
+    for user_id, counts in stats.items():
+        review_count = sum(counts.values())
+        rating_sum = sum(rating * total for rating, total in counts.items())
+        histogram = {f'rating_{rating}_count': counts.get(rating, 0) for rating in range(1, 6)}
+        BusinessProfileStats.objects.update_or_create(user_id=user_id, defaults=dict(
+            review_count=review_count, rating_sum=rating_sum,
+            average_rating=rating_sum / review_count, **histogram))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0013_task_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='average_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_1_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_2_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_3_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_4_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_5_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='rating_sum',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessprofilestats',
+            name='review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='businessprofilestats',
+            index=models.Index(fields=['-average_rating', '-user'], name='stats_rating_idx'),
+        ),
+        migrations.RunPython(fill_rating_stats, migrations.RunPython.noop),
+    ]
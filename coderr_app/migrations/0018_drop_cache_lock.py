@@ -0,0 +1,16 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0017_rate_counter'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='CacheLock',
+        ),
+    ]
@@ -1,6 +1,11 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Min, OuterRef, Subquery
 from django.contrib.auth.models import AbstractUser
 
+from .images import validate_image
+
 
 class CustomUser(AbstractUser):
     """
@@ -8,6 +13,7 @@ class CustomUser(AbstractUser):
 
     Attribute:
         file (FileField): Optionales Profilbild.
+        file_variants (JSONField): Verkleinerte Varianten des Profilbilds.
         location (CharField): Standort des Nutzers.
         tel (CharField): Telefonnummer des Nutzers.
         description (TextField): Beschreibung des Nutzers.
@@ -16,7 +22,8 @@ class CustomUser(AbstractUser):
         created_at (DateTimeField): Erstellungsdatum des Accounts.
     """
     file = models.FileField(
-        upload_to="profile_pictures/", blank=True, null=True)
+        upload_to="profile_pictures/", blank=True, null=True, validators=[validate_image])
+    file_variants = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=100, blank=True)
     tel = models.CharField(max_length=20, blank=True)
     description = models.TextField(blank=True)
@@ -25,6 +32,31 @@ class CustomUser(AbstractUser):
         "business", "Business"), ("customer", "Customer")])
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['type', '-created_at'],
+                         name='user_type_created_idx'),
+        ]
+
+
+class OfferQuerySet(models.QuerySet):
+
+    def refresh_summaries(self, **fields):
+        """
+        Berechnet min_price und min_delivery_time aller Angebote im QuerySet
+        mit einem einzigen UPDATE aus den zugehörigen OfferDetails neu.
+        Weitere Spalten (z. B. updated_at) können über fields mitgesetzt werden.
+        """
+        details = OfferDetail.objects.filter(
+            offer=OuterRef('pk')).order_by().values('offer')
+        return self.update(
+            min_price=Subquery(
+                details.annotate(value=Min('price')).values('value')),
+            min_delivery_time=Subquery(
+                details.annotate(value=Min('delivery_time_in_days')).values('value')),
+            **fields,
+        )
+
 
 class Offer(models.Model):
     """
@@ -34,17 +66,36 @@ class Offer(models.Model):
         user (ForeignKey): Der Anbieter des Angebots.
         title (CharField): Titel des Angebots.
         image (FileField): Optionales Angebotsbild.
+        image_variants (JSONField): Verkleinerte Varianten des Angebotsbilds.
         description (TextField): Beschreibung des Angebots.
+        min_price (DecimalField): Günstigster Preis aller Details (denormalisiert).
+        min_delivery_time (IntegerField): Kürzeste Lieferzeit aller Details (denormalisiert).
         created_at (DateTimeField): Zeitpunkt der Erstellung.
         updated_at (DateTimeField): Zeitpunkt der letzten Aktualisierung.
     """
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
-    image = models.FileField(upload_to="offer_images/", null=True, blank=True)
+    image = models.FileField(upload_to="offer_images/", null=True, blank=True,
+                             validators=[validate_image])
+    image_variants = models.JSONField(default=dict, blank=True)
     description = models.TextField()
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.IntegerField(
+        null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-updated_at'],
+                         name='offer_user_updated_idx'),
+            models.Index(fields=['-updated_at', '-id'],
+                         name='offer_updated_id_idx'),
+        ]
+
 
 class OfferDetail(models.Model):
     """
@@ -76,6 +127,12 @@ class OfferDetail(models.Model):
         default="basic"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['offer', 'offer_type'], name='unique_offer_type_per_offer'),
+        ]
+
 
 class Order(models.Model):
     """
@@ -116,6 +173,22 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'],
+                         name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'status'],
+                         name='order_customer_status_idx'),
+            models.Index(fields=['customer_user', '-created_at'],
+                         name='order_customer_created_idx'),
+            models.Index(fields=['business_user', '-created_at'],
+                         name='order_business_created_idx'),
+            models.Index(fields=['customer_user', 'updated_at'],
+                         name='order_customer_updated_idx'),
+            models.Index(fields=['business_user', 'updated_at'],
+                         name='order_business_updated_idx'),
+        ]
+
 
 class Review(models.Model):
     """
@@ -140,18 +213,176 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business_user', 'reviewer'], name='unique_review_per_business_user'),
+        ]
+        indexes = [
+            models.Index(fields=['-created_at', '-id'],
+                         name='review_created_id_idx'),
+            models.Index(fields=['updated_at', 'id'],
+                         name='review_updated_id_idx'),
+        ]
+
 
 class BaseInfo(models.Model):
     """
     Statistische Informationen über die Plattform.
 
+    Es existiert genau eine Zeile (pk=1), deren Zähler bei jeder Änderung
+    an Bewertungen, Angeboten und Nutzern inkrementell angepasst werden.
+
     Attribute:
         review_count (IntegerField): Gesamtanzahl der Bewertungen.
-        average_rating (IntegerField): Durchschnittliche Bewertung.
+        rating_sum (BigIntegerField): Summe aller Bewertungswerte.
         business_profile_count (IntegerField): Anzahl der Business-Profile.
         offer_count (IntegerField): Gesamtanzahl der Angebote.
     """
-    review_count = models.IntegerField()
-    average_rating = models.IntegerField()
-    business_profile_count = models.IntegerField()
-    offer_count = models.IntegerField()
+    SINGLETON_PK = 1
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return Decimal(0)
+        return Decimal(self.rating_sum) / self.review_count
+
+
+class BusinessProfileStats(models.Model):
+    """
+    Vorberechnete Kennzahlen eines Business-Profils.
+
+    Die Zähler werden bei jeder Bestellungs- bzw. Bewertungsänderung atomar
+    angepasst, sodass Abfragen weder die Order- noch die Review-Tabelle
+    lesen müssen.
+
+    Attribute:
+        user (OneToOneField): Das zugehörige Business-Profil.
+        in_progress_count (IntegerField): Anzahl laufender Bestellungen.
+        completed_count (IntegerField): Anzahl abgeschlossener Bestellungen.
+        cancelled_count (IntegerField): Anzahl abgebrochener Bestellungen.
+        review_count (IntegerField): Anzahl erhaltener Bewertungen.
+        rating_sum (BigIntegerField): Summe der Bewertungswerte.
+        average_rating (FloatField): rating_sum / review_count, für die Sortierung.
+        rating_1_count … rating_5_count (IntegerField): Bewertungen je Sternezahl.
+    """
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="profile_stats"
+    )
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    average_rating = models.FloatField(default=0)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-average_rating', '-user'],
+                         name='stats_rating_idx'),
+        ]
+
+
+class Task(models.Model):
+    """
+    Eintrag der datenbankbasierten Aufgaben-Warteschlange (siehe tasks.py).
+
+    Erfolgreich ausgeführte Aufgaben werden gelöscht; fehlgeschlagene bleiben
+    nach max_attempts Versuchen mit Status "failed" zur Analyse erhalten.
+
+    Attribute:
+        name (CharField): Registrierter Name der Aufgabe.
+        args (JSONField): Positionsargumente.
+        kwargs (JSONField): Schlüsselwortargumente.
+        status (CharField): queued, running oder failed.
+        attempts (IntegerField): Bisherige Ausführungsversuche.
+        max_attempts (IntegerField): Maximale Anzahl Versuche.
+        run_after (DateTimeField): Frühester Ausführungszeitpunkt.
+        locked_at (DateTimeField): Beginn der laufenden Ausführung.
+        last_error (TextField): Traceback des letzten Fehlschlags.
+        created_at (DateTimeField): Zeitpunkt des Einreihens.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'],
+                         name='task_status_run_after_idx'),
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    Vermerk über ein gelöschtes Angebot, eine Bestellung oder Bewertung,
+    damit ?updated_since= auch Löschungen melden kann (siehe api/delta.py).
+
+    Die Nutzer-IDs sind einfache Zahlen statt Fremdschlüssel, da die Nutzer
+    selbst bereits gelöscht sein können.
+
+    Attribute:
+        kind (CharField): Art des Objekts (offer, order, review).
+        object_id (BigIntegerField): Primärschlüssel des gelöschten Objekts.
+        user_id (BigIntegerField): Kunde bzw. Verfasser, für Sichtbarkeit und Filter.
+        business_user_id (BigIntegerField): Anbieter bzw. bewertetes Business-Profil.
+        deleted_at (DateTimeField): Zeitpunkt der Löschung.
+    """
+    KIND_CHOICES = [
+        ('offer', 'Offer'),
+        ('order', 'Order'),
+        ('review', 'Review'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    business_user_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at'],
+                         name='tombstone_kind_deleted_idx'),
+        ]
+
+
+class RateCounter(models.Model):
+    """
+    Zähler der Ratenbegrenzung für Caches ohne atomares incr (Datei- und
+    Datenbankcache), siehe api/throttling.py. Erhöht wird per INSERT ...
+    ON CONFLICT DO UPDATE, sodass gleichzeitige Worker keine Zählungen
+    verlieren; abgelaufene Zeilen entfernt manage.py prune_rate_counters.
+
+    Attribute:
+        key (CharField): Schlüssel aus Scope, Client und Zeitfenster.
+        count (IntegerField): Anzahl Requests im Zeitfenster.
+        expires_at (DateTimeField): Ablauf des Zählers.
+    """
+    key = models.CharField(max_length=255, primary_key=True)
+    count = models.IntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
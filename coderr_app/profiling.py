@@ -0,0 +1,203 @@
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('coderr_app.profiling')
+
+_current_profile = ContextVar('coderr_request_profile', default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+
+
+def fingerprint(sql):
+    """
+    Normalisiert SQL, sodass sich Abfragen nur in ihren Parametern nicht unterscheiden.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    return _PLACEHOLDER_LIST.sub('(?)', sql)
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+class RequestProfile:
+    """
+    Sammelt Abfragen, DB-Zeit und Serializer-Zeit eines einzelnen Requests.
+
+    Wird als execute_wrapper auf allen Datenbankverbindungen registriert.
+    """
+
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.fingerprints = Counter()
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.db_time += duration
+            self.fingerprints[fingerprint(sql)] += 1
+            if duration * 1000 >= self.slow_query_ms:
+                self.slow_queries.append(
+                    {'sql': sql, 'ms': round(duration * 1000, 3)})
+
+    def repeated_queries(self, threshold):
+        return [
+            {'fingerprint': sql, 'count': count}
+            for sql, count in self.fingerprints.most_common() if count >= threshold
+        ]
+
+
+@lru_cache(maxsize=None)
+def _timed_serializer_class(serializer_class):
+    def data(self):
+        start = time.perf_counter()
+        try:
+            return super(timed_class, self).data
+        finally:
+            profile = current_profile()
+            if profile is not None:
+                profile.serializer_time += time.perf_counter() - start
+
+    timed_class = type(serializer_class.__name__,
+                       (serializer_class,), {'data': property(data)})
+    return timed_class
+
+
+class ProfiledViewMixin:
+    """
+    DRF-Hook: misst die Zeit, die in serializer.data verbracht wird, wenn der
+    aktuelle Request von QueryProfilingMiddleware erfasst wird.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if current_profile() is not None:
+            serializer.__class__ = _timed_serializer_class(
+                serializer.__class__)
+        return serializer
+
+
+class QueryProfilingMiddleware:
+    """
+    Erfasst für eine Stichprobe der Requests Abfrageanzahl, DB-Zeit,
+    Serializer-Zeit und wiederholte Abfragen (N+1-Verdacht).
+
+    Die Werte werden als Server-Timing-Header und als JSON-Logzeile
+    ('coderr_app.profiling') ausgegeben. Konfiguration über
+    settings.QUERY_PROFILING (ENABLED, SAMPLE_RATE, SLOW_QUERY_MS,
+    N_PLUS_ONE_THRESHOLD). Unter ASGI läuft die Middleware nativ asynchron.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        config = settings.QUERY_PROFILING
+        if not self.sampled(config):
+            return self.get_response(request)
+
+        profile = RequestProfile(config['SLOW_QUERY_MS'])
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self.attach(stack, profile)
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total_time = time.perf_counter() - start
+
+        self.report(request, response, profile, total_time,
+                    config['N_PLUS_ONE_THRESHOLD'])
+        return response
+
+    async def __acall__(self, request):
+        config = settings.QUERY_PROFILING
+        if not self.sampled(config):
+            return await self.get_response(request)
+
+        profile = RequestProfile(config['SLOW_QUERY_MS'])
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            # Abfragen laufen im thread-sensitiven Thread des Requests, daher
+            # wird der Wrapper auch dort auf den Verbindungen registriert
+            await sync_to_async(self.attach)(stack, profile)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current_profile.reset(token)
+        total_time = time.perf_counter() - start
+
+        self.report(request, response, profile, total_time,
+                    config['N_PLUS_ONE_THRESHOLD'])
+        return response
+
+    def sampled(self, config):
+        return config['ENABLED'] and random.random() < config['SAMPLE_RATE']
+
+    def attach(self, stack, profile):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+    def report(self, request, response, profile, total_time, n_plus_one_threshold):
+        db_ms = profile.db_time * 1000
+        serializer_ms = profile.serializer_time * 1000
+        total_ms = total_time * 1000
+        view_ms = max(total_ms - db_ms - serializer_ms, 0)
+
+        response['Server-Timing'] = ", ".join([
+            f'db;dur={db_ms:.2f};desc="{profile.query_count} queries"',
+            f'serializer;dur={serializer_ms:.2f}',
+            f'view;dur={view_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+
+        repeated = profile.repeated_queries(n_plus_one_threshold)
+        resolver_match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': resolver_match.view_name if resolver_match else None,
+            'status': response.status_code,
+            'queries': profile.query_count,
+            'db_ms': round(db_ms, 3),
+            'serializer_ms': round(serializer_ms, 3),
+            'view_ms': round(view_ms, 3),
+            'total_ms': round(total_ms, 3),
+            'n_plus_one': repeated,
+            'slow_queries': profile.slow_queries,
+        }))
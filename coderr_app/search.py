@@ -0,0 +1,142 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Offer
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Zerlegt eine Suchanfrage in Wörter; Sonderzeichen werden verworfen.
+    """
+    return TOKEN_PATTERN.findall(query or "")
+
+
+class SearchBackend:
+    """
+    Schnittstelle für austauschbare Suchindizes über Angebote.
+
+    Ein Backend muss den Index bei Änderungen aktuell halten (index_offer,
+    remove_offer) und einen Offer-QuerySet nach einer Suchanfrage filtern
+    und nach Relevanz sortieren können (search).
+    """
+
+    def index_offer(self, offer):
+        raise NotImplementedError
+
+    def remove_offer(self, offer_id):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class SubstringSearchBackend(SearchBackend):
+    """
+    Fallback ohne eigenen Index: icontains über Titel und Beschreibung.
+    """
+
+    def index_offer(self, offer):
+        pass
+
+    def remove_offer(self, offer_id):
+        pass
+
+    def rebuild(self):
+        return 0
+
+    def search(self, queryset, query):
+        for term in tokenize(query):
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset
+
+
+class SqliteFTS5SearchBackend(SearchBackend):
+    """
+    Invertierter Index als SQLite-FTS5-Tabelle, deren rowid der Offer-ID entspricht.
+
+    Jedes Suchwort wird als Präfix gesucht, die Treffer werden per bm25
+    sortiert, wobei Treffer im Titel stärker gewichtet werden.
+    """
+    table = 'coderr_app_offer_fts'
+    title_weight = 10.0
+    description_weight = 1.0
+
+    def create_table(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+            "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def index_offer(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [offer.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, description) VALUES (%s, %s, %s)",
+                [offer.pk, offer.title, offer.description],
+            )
+
+    def remove_offer(self, offer_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [offer_id])
+
+    def rebuild(self):
+        offer_table = Offer._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, description) "
+                f"SELECT id, title, description FROM {offer_table}"
+            )
+            return cursor.rowcount
+
+    def build_match_expression(self, query):
+        return " ".join(f'"{term}"*' for term in tokenize(query))
+
+    def search(self, queryset, query):
+        match_expression = self.build_match_expression(query)
+        if not match_expression:
+            return queryset
+
+        offer_table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                f"{self.table}.rowid = {offer_table}.id",
+                f"{self.table} MATCH %s",
+            ],
+            params=[match_expression],
+            select={
+                'search_rank': f"bm25({self.table}, {self.title_weight}, {self.description_weight})",
+            },
+            order_by=['search_rank'],
+        )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """
+    Liefert das konfigurierte Such-Backend (settings.OFFER_SEARCH_BACKEND).
+
+    Ohne Konfiguration wird unter SQLite der FTS5-Index verwendet, sonst
+    die Substring-Suche.
+    """
+    backend_path = getattr(settings, 'OFFER_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'sqlite':
+        return SqliteFTS5SearchBackend()
+    return SubstringSearchBackend()
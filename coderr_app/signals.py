@@ -0,0 +1,217 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .models import BusinessProfileStats, CustomUser, Offer, OfferDetail, Order, Review, Tombstone
+from .api.authentication import token_user_cache
+from .caching import OFFER_CACHE_NAMESPACE, bump_namespace_version
+from .images import delete_variants, schedule_image_processing, variants_updated
+from .search import get_search_backend
+from .stats import bump_base_info, bump_order_count, bump_review_stats
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_summary(sender, instance, **kwargs):
+    # updated_at mitsetzen, damit ?updated_since= geänderte Details meldet
+    Offer.objects.filter(pk=instance.offer_id).refresh_summaries(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Offer)
+def index_offer(sender, instance, **kwargs):
+    get_search_backend().index_offer(instance)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_index(sender, instance, **kwargs):
+    get_search_backend().remove_offer(instance.pk)
+
+
+# Ursprungswerte merken, damit Änderungen als Differenz gezählt werden können
+@receiver(post_init, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    instance._original_rating = instance.__dict__.get('rating')
+    instance._original_business_user_id = instance.__dict__.get('business_user_id')
+
+
+@receiver(post_init, sender=CustomUser)
+def remember_user_type(sender, instance, **kwargs):
+    instance._original_type = instance.__dict__.get('type')
+    instance._original_file = instance.__dict__.get('file')
+
+
+@receiver(post_init, sender=Offer)
+def remember_offer_image(sender, instance, **kwargs):
+    instance._original_image = instance.__dict__.get('image')
+
+
+@receiver(post_init, sender=Order)
+def remember_order_bucket(sender, instance, **kwargs):
+    instance._original_bucket = (
+        instance.__dict__.get('business_user_id'), instance.__dict__.get('status'))
+
+
+# Muss vor count_saved_review laufen, da diese _original_rating überschreibt
+@receiver(post_save, sender=Review)
+def count_business_rating(sender, instance, created, **kwargs):
+    original = (instance._original_business_user_id, instance._original_rating)
+    if not created and original[1] is not None:
+        if original == (instance.business_user_id, instance.rating):
+            return
+        if original[0] == instance.business_user_id:
+            # Geänderte Sternezahl mit einem einzigen UPDATE
+            bump_review_stats(original[0], {original[1]: -1, instance.rating: 1})
+            return
+        bump_review_stats(original[0], {original[1]: -1})
+    bump_review_stats(instance.business_user_id, {instance.rating: 1})
+    instance._original_business_user_id = instance.business_user_id
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_business_rating(sender, instance, **kwargs):
+    bump_review_stats(instance.business_user_id, {instance.rating: -1})
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, **kwargs):
+    if created:
+        bump_base_info(review_count=1, rating_sum=instance.rating)
+    elif instance._original_rating is not None:
+        bump_base_info(
+            rating_sum=instance.rating - instance._original_rating)
+    instance._original_rating = instance.rating
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    bump_base_info(review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(post_save, sender=Offer)
+def count_saved_offer(sender, instance, created, **kwargs):
+    if created:
+        bump_base_info(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def count_deleted_offer(sender, instance, **kwargs):
+    bump_base_info(offer_count=-1)
+
+
+@receiver(post_save, sender=CustomUser)
+def count_saved_user(sender, instance, created, **kwargs):
+    if created or instance._original_type is not None:
+        was_business = not created and instance._original_type == 'business'
+        is_business = instance.type == 'business'
+        bump_base_info(business_profile_count=int(
+            is_business) - int(was_business))
+        if is_business and not was_business:
+            # Jedes Business-Profil hat eine Zeile, damit nach Bewertung sortiert werden kann
+            BusinessProfileStats.objects.get_or_create(user_id=instance.pk)
+    instance._original_type = instance.type
+
+
+@receiver(post_delete, sender=CustomUser)
+def count_deleted_user(sender, instance, **kwargs):
+    if instance.type == 'business':
+        bump_base_info(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, **kwargs):
+    bucket = (instance.business_user_id, instance.status)
+    if not created:
+        if bucket == instance._original_bucket:
+            return
+        bump_order_count(*instance._original_bucket, -1)
+    bump_order_count(*bucket, 1)
+    instance._original_bucket = bucket
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, **kwargs):
+    bump_order_count(instance.business_user_id, instance.status, -1)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    token_user_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    token_user_cache.invalidate_user(instance.pk)
+
+
+# Angebotsantworten enthalten Details und Anbieterdaten, daher auch bei deren Änderung invalidieren
+OFFER_USER_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Offer)
+def invalidate_saved_offer(sender, instance, **kwargs):
+    bump_namespace_version(OFFER_CACHE_NAMESPACE, instance.updated_at)
+
+
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offers(sender, instance, **kwargs):
+    bump_namespace_version(OFFER_CACHE_NAMESPACE)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_offers_of_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or OFFER_USER_FIELDS.intersection(update_fields):
+        bump_namespace_version(OFFER_CACHE_NAMESPACE)
+
+
+# Neue Bilder im Hintergrund verkleinern; Vergleich über den gespeicherten Dateinamen
+IMAGE_FIELDS = {
+    Offer: ('image', 'image_variants', '_original_image'),
+    CustomUser: ('file', 'file_variants', '_original_file'),
+}
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=CustomUser)
+def process_uploaded_image(sender, instance, **kwargs):
+    field_name, variants_field, original_attr = IMAGE_FIELDS[sender]
+    name = getattr(instance, field_name).name or None
+    original = getattr(instance, original_attr)
+    if name == (getattr(original, 'name', original) or None):
+        return
+    setattr(instance, original_attr, name)
+    if name:
+        schedule_image_processing(sender, instance.pk, field_name, variants_field)
+    elif getattr(instance, variants_field):
+        delete_variants(getattr(instance, field_name).storage, getattr(instance, variants_field))
+        sender.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+        setattr(instance, variants_field, {})
+
+
+@receiver(variants_updated, sender=Offer)
+def invalidate_offer_variants(sender, pk, **kwargs):
+    Offer.objects.filter(pk=pk).update(updated_at=timezone.now())
+    bump_namespace_version(OFFER_CACHE_NAMESPACE)
+
+
+# Löschvermerke für ?updated_since= (siehe api/delta.py)
+TOMBSTONE_USERS = {
+    Offer: ('offer', None, 'user_id'),
+    Order: ('order', 'customer_user_id', 'business_user_id'),
+    Review: ('review', 'reviewer_id', 'business_user_id'),
+}
+
+
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Review)
+def record_tombstone(sender, instance, **kwargs):
+    kind, user_field, business_user_field = TOMBSTONE_USERS[sender]
+    Tombstone.objects.create(
+        kind=kind, object_id=instance.pk,
+        user_id=getattr(instance, user_field) if user_field else None,
+        business_user_id=getattr(instance, business_user_field))
@@ -0,0 +1,271 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .caching import (BASE_INFO_CACHE_NAMESPACE, bump_namespace_version,
+                      get_namespace_version, get_or_compute, namespaced_key)
+from .tasks import enqueue_once, task
+from .models import BaseInfo, BusinessProfileStats, CustomUser, Offer, Order, Review
+
+
+ORDER_STATUS_FIELDS = {
+    'in_progress': 'in_progress_count',
+    'completed': 'completed_count',
+    'cancelled': 'cancelled_count',
+}
+
+RATING_FIELDS = {rating: f'rating_{rating}_count' for rating in range(1, 6)}
+
+
+def compute_base_info():
+    """
+    Berechnet alle Plattform-Zähler vollständig aus den Quelltabellen.
+    """
+    return {
+        'review_count': Review.objects.count(),
+        'rating_sum': Review.objects.aggregate(total=Sum('rating'))['total'] or 0,
+        'business_profile_count': CustomUser.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    }
+
+
+@task
+def reconcile_base_info():
+    """
+    Schreibt die neu berechneten Zähler in die BaseInfo-Zeile.
+
+    Gibt die Abweichungen als {feld: (gespeichert, tatsächlich)} zurück.
+    """
+    actual = compute_base_info()
+    with transaction.atomic():
+        base_info, created = BaseInfo.objects.select_for_update().get_or_create(
+            pk=BaseInfo.SINGLETON_PK, defaults=actual)
+        drift = {
+            field: (getattr(base_info, field), value)
+            for field, value in actual.items()
+            if getattr(base_info, field) != value
+        }
+        if drift:
+            BaseInfo.objects.filter(pk=base_info.pk).update(**actual)
+    invalidate_base_info()
+    return drift
+
+
+def bump_base_info(**deltas):
+    """
+    Passt die Zähler atomar per F()-Ausdruck an, z. B. bump_base_info(offer_count=1).
+    """
+    changes = {field: F(field) + delta for field,
+               delta in deltas.items() if delta}
+    if not changes:
+        return
+    updated = BaseInfo.objects.filter(
+        pk=BaseInfo.SINGLETON_PK).update(**changes)
+    if not updated:
+        # Fehlende Zeile im Hintergrund neu berechnen; get_base_info legt sie
+        # bei Bedarf auch selbst an. Eine wartende Neuberechnung genügt.
+        enqueue_once(reconcile_base_info)
+    invalidate_base_info()
+
+
+def invalidate_base_info():
+    bump_namespace_version(BASE_INFO_CACHE_NAMESPACE)
+
+
+def get_base_info():
+    """
+    Liefert die Antwortdaten für /base-info/ aus dem Cache oder der BaseInfo-Zeile.
+
+    Bei leerem Cache berechnet nur ein Aufrufer neu (get_or_compute).
+    """
+    version = get_namespace_version(BASE_INFO_CACHE_NAMESPACE)[0]
+    return get_or_compute(namespaced_key(BASE_INFO_CACHE_NAMESPACE, 'summary', version=version),
+                          _load_base_info, settings.BASE_INFO_CACHE_TIMEOUT, changed_ns=version)
+
+
+def _load_base_info():
+    base_info = BaseInfo.objects.filter(pk=BaseInfo.SINGLETON_PK).first()
+    if base_info is None:
+        reconcile_base_info()
+        base_info = BaseInfo.objects.get(pk=BaseInfo.SINGLETON_PK)
+
+    return {
+        "review_count": base_info.review_count,
+        "average_rating": round(base_info.average_rating, 1),
+        "business_profile_count": base_info.business_profile_count,
+        "offer_count": base_info.offer_count,
+    }
+
+
+def bump_order_count(business_user_id, status, delta):
+    """
+    Passt den Zähler des Status-Buckets eines Business-Profils atomar an.
+    """
+    field = ORDER_STATUS_FIELDS.get(status)
+    if business_user_id is None or field is None or not delta:
+        return
+    stats = BusinessProfileStats.objects.filter(user_id=business_user_id)
+    if not stats.update(**{field: F(field) + delta}) and delta > 0:
+        BusinessProfileStats.objects.get_or_create(user_id=business_user_id)
+        stats.update(**{field: F(field) + delta})
+
+
+def bump_review_stats(business_user_id, ratings):
+    """
+    Passt die Bewertungszähler eines Business-Profils atomar an.
+
+    ratings ist {sterne: delta}, z. B. {5: 1} für eine neue und
+    {3: -1, 4: 1} für eine von 3 auf 4 Sterne geänderte Bewertung.
+    """
+    ratings = {rating: delta for rating, delta in ratings.items() if delta}
+    if business_user_id is None or not ratings:
+        return
+    count_delta = sum(ratings.values())
+    sum_delta = sum(rating * delta for rating, delta in ratings.items())
+    # SET-Ausdrücke sehen die alten Spaltenwerte, daher die Deltas explizit
+    changes = {
+        'review_count': F('review_count') + count_delta,
+        'rating_sum': F('rating_sum') + sum_delta,
+        'average_rating': Coalesce(
+            Cast(F('rating_sum') + sum_delta, FloatField()) /
+            NullIf(F('review_count') + count_delta, 0), 0.0),
+    }
+    for rating, delta in ratings.items():
+        field = RATING_FIELDS.get(rating)
+        if field is not None:
+            changes[field] = F(field) + delta
+    stats = BusinessProfileStats.objects.filter(user_id=business_user_id)
+    if not stats.update(**changes) and count_delta > 0:
+        BusinessProfileStats.objects.get_or_create(user_id=business_user_id)
+        stats.update(**changes)
+
+
+def get_order_counts(user_id):
+    """
+    Liefert die Bestellzähler eines Business-Profils mit einer einzigen Abfrage.
+
+    Gibt None zurück, wenn kein Business-Profil mit dieser ID existiert.
+    """
+    return _order_counts(_profile_stats(_profile_stats_queryset(user_id).first()))
+
+
+async def aget_order_counts(user_id):
+    """
+    Async-Variante von get_order_counts.
+    """
+    return _order_counts(_profile_stats(await _profile_stats_queryset(user_id).afirst()))
+
+
+def get_rating_stats(user_id):
+    """
+    Liefert Anzahl, Durchschnitt und Sterne-Histogramm der Bewertungen eines
+    Business-Profils, ohne die Review-Tabelle zu lesen.
+
+    Gibt None zurück, wenn kein Business-Profil mit dieser ID existiert.
+    """
+    stats = _profile_stats(_profile_stats_queryset(user_id).first())
+    return rating_summary(stats) if stats is not None else None
+
+
+def rating_summary(stats):
+    average = Decimal(stats.rating_sum) / stats.review_count if stats.review_count else Decimal(0)
+    return {
+        'review_count': stats.review_count,
+        'average_rating': round(average, 1),
+        'rating_histogram': {
+            str(rating): getattr(stats, field) for rating, field in RATING_FIELDS.items()},
+    }
+
+
+def _profile_stats_queryset(user_id):
+    return CustomUser.objects.filter(pk=user_id).select_related('profile_stats')
+
+
+def _profile_stats(user):
+    if user is None or user.type != 'business':
+        return None
+    try:
+        return user.profile_stats
+    except BusinessProfileStats.DoesNotExist:
+        return BusinessProfileStats(user=user)
+
+
+def _order_counts(stats):
+    if stats is None:
+        return None
+    return {status: getattr(stats, field) for status, field in ORDER_STATUS_FIELDS.items()}
+
+
+def reconcile_order_counts():
+    """
+    Berechnet alle Bestellzähler aus der Order-Tabelle neu.
+
+    Gibt die Anzahl der korrigierten Business-Profile zurück.
+    """
+    actual = {}
+    rows = Order.objects.filter(business_user__isnull=False, status__in=ORDER_STATUS_FIELDS).values(
+        'business_user', 'status').annotate(total=Count('id')).order_by()
+    for row in rows:
+        counts = actual.setdefault(row['business_user'], dict.fromkeys(
+            ORDER_STATUS_FIELDS.values(), 0))
+        counts[ORDER_STATUS_FIELDS[row['status']]] = row['total']
+
+    corrected = 0
+    with transaction.atomic():
+        existing = {
+            stats.user_id: stats for stats in BusinessProfileStats.objects.select_for_update()}
+        for user_id in existing.keys() | actual.keys():
+            counts = actual.get(user_id, dict.fromkeys(
+                ORDER_STATUS_FIELDS.values(), 0))
+            stats = existing.get(user_id)
+            if stats is None:
+                BusinessProfileStats.objects.create(user_id=user_id, **counts)
+                corrected += 1
+            elif any(getattr(stats, field) != value for field, value in counts.items()):
+                BusinessProfileStats.objects.filter(
+                    user_id=user_id).update(**counts)
+                corrected += 1
+    return corrected
+
+
+def reconcile_rating_stats():
+    """
+    Berechnet die Bewertungszähler aller Business-Profile aus der
+    Review-Tabelle neu und legt fehlende Zeilen an.
+
+    Gibt die Anzahl der korrigierten Business-Profile zurück.
+    """
+    empty = dict.fromkeys(['review_count', 'rating_sum', *RATING_FIELDS.values()], 0)
+    actual = {}
+    rows = Review.objects.values('business_user', 'rating').annotate(
+        total=Count('id')).order_by()
+    for row in rows:
+        counts = actual.setdefault(row['business_user'], dict(empty))
+        counts['review_count'] += row['total']
+        counts['rating_sum'] += row['rating'] * row['total']
+        field = RATING_FIELDS.get(row['rating'])
+        if field is not None:
+            counts[field] = row['total']
+    for counts in actual.values():
+        counts['average_rating'] = counts['rating_sum'] / counts['review_count']
+
+    corrected = 0
+    with transaction.atomic():
+        business_ids = set(CustomUser.objects.filter(
+            type='business').values_list('pk', flat=True))
+        existing = {
+            stats.user_id: stats for stats in BusinessProfileStats.objects.select_for_update()}
+        for user_id in existing.keys() | actual.keys() | business_ids:
+            counts = actual.get(user_id, {**empty, 'average_rating': 0})
+            stats = existing.get(user_id)
+            if stats is None:
+                BusinessProfileStats.objects.create(user_id=user_id, **counts)
+                corrected += 1
+            elif any(getattr(stats, field) != value for field, value in counts.items()):
+                BusinessProfileStats.objects.filter(
+                    user_id=user_id).update(**counts)
+                corrected += 1
+    return corrected
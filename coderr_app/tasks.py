@@ -0,0 +1,225 @@
+"""
+Datenbankbasierte Aufgaben-Warteschlange ohne externen Broker.
+
+Aufgaben werden mit @task registriert und per enqueue() in derselben
+Transaktion wie die auslösende Änderung eingereiht; ein Worker
+(manage.py run_tasks) führt sie erst nach dem Commit aus. Fehlgeschlagene
+Aufgaben werden mit exponentiell wachsender Wartezeit wiederholt.
+"""
+import logging
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from multiprocessing import get_context
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger('coderr_app.tasks')
+
+
+def task(func=None, *, max_attempts=3):
+    """
+    Markiert eine Funktion auf Modulebene als Aufgabe. Argumente müssen
+    JSON-serialisierbar sein.
+    """
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__qualname__}'
+        func.max_attempts = max_attempts
+        return func
+
+    return register(func) if func is not None else register
+
+
+def resolve_task(name):
+    func = import_string(name)
+    # Nur registrierte Aufgaben ausführen, keine beliebigen Funktionen
+    if getattr(func, 'task_name', None) != name:
+        raise ImportError(f'{name} ist keine registrierte Aufgabe.')
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Reiht func(*args, **kwargs) ein. Mit settings.TASKS_EAGER wird die
+    Aufgabe stattdessen nach dem Commit im aktuellen Prozess ausgeführt.
+    """
+    from .models import Task
+
+    entry = Task.objects.create(
+        name=func.task_name, args=list(args), kwargs=kwargs,
+        max_attempts=func.max_attempts, run_after=timezone.now())
+    if settings.TASKS_EAGER:
+        transaction.on_commit(lambda: _claim(entry.pk, 'queued', None) and run_task(entry.pk))
+    return entry
+
+
+def enqueue_once(func, *args, **kwargs):
+    """
+    Wie enqueue, reiht aber nicht erneut ein, solange dieselbe Aufgabe mit
+    denselben Argumenten noch wartet.
+    """
+    from .models import Task
+
+    pending = Task.objects.filter(
+        name=func.task_name, status='queued', args=list(args), kwargs=kwargs).first()
+    return pending or enqueue(func, *args, **kwargs)
+
+
+def _claim(pk, status, locked_at):
+    from .models import Task
+
+    return Task.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+        status='running', locked_at=timezone.now(), attempts=F('attempts') + 1)
+
+
+def claim_tasks(limit):
+    """
+    Beansprucht bis zu limit fällige Aufgaben und gibt ihre IDs zurück.
+
+    Jede Aufgabe wird per bedingtem UPDATE übernommen, sodass mehrere Worker
+    dieselbe Aufgabe nie doppelt erhalten (auch ohne SKIP LOCKED). Aufgaben,
+    die länger als TASK_LOCK_TIMEOUT laufen, gelten als abgebrochen.
+    """
+    from .models import Task
+
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT)
+    candidates = Task.objects.filter(
+        Q(status='queued', run_after__lte=now) | Q(status='running', locked_at__lt=stale)
+    ).order_by('run_after', 'id').values_list('pk', 'status', 'locked_at')[:limit]
+    return [pk for pk, status, locked_at in candidates if _claim(pk, status, locked_at)]
+
+
+def run_task(pk):
+    """
+    Führt eine beanspruchte Aufgabe aus. Gibt 'done', 'queued' (Wiederholung
+    geplant) oder 'failed' zurück.
+    """
+    from .models import Task
+
+    entry = Task.objects.filter(pk=pk).first()
+    if entry is None:
+        return None
+    try:
+        resolve_task(entry.name)(*entry.args, **entry.kwargs)
+    except Exception:
+        return _retry_or_fail(entry, traceback.format_exc())
+
+    Task.objects.filter(pk=pk).delete()
+    return 'done'
+
+
+def _retry_or_fail(entry, error):
+    """
+    Plant einen weiteren Versuch mit exponentiell wachsender Wartezeit oder
+    markiert die Aufgabe nach max_attempts als fehlgeschlagen.
+    """
+    from .models import Task
+
+    logger.warning("Aufgabe %s (%s) fehlgeschlagen, Versuch %s/%s",
+                   entry.pk, entry.name, entry.attempts, entry.max_attempts)
+    if entry.attempts < entry.max_attempts:
+        delay = settings.TASK_RETRY_DELAY * 2 ** (entry.attempts - 1)
+        Task.objects.filter(pk=entry.pk).update(
+            status='queued', locked_at=None, last_error=error,
+            run_after=timezone.now() + timedelta(seconds=delay))
+        return 'queued'
+    Task.objects.filter(pk=entry.pk).update(
+        status='failed', locked_at=None, last_error=error)
+    return 'failed'
+
+
+def release_tasks(pks, error):
+    """
+    Gibt beanspruchte Aufgaben, deren Ausführung abgebrochen wurde, sofort
+    wieder frei, statt auf TASK_LOCK_TIMEOUT zu warten. Ein Abbruch zählt
+    als Fehlversuch, damit eine Aufgabe, die den Prozess jedes Mal beendet,
+    nicht endlos wiederholt wird.
+    """
+    from .models import Task
+
+    for entry in Task.objects.filter(pk__in=pks, status='running'):
+        _retry_or_fail(entry, error)
+
+
+def run_pending_tasks():
+    """
+    Führt alle fälligen Aufgaben im aktuellen Prozess aus (Tests, run_tasks --once).
+    """
+    results = []
+    while True:
+        claimed = claim_tasks(100)
+        if not claimed:
+            return results
+        results.extend(run_task(pk) for pk in claimed)
+
+
+def _start_pool(processes):
+    # "spawn" statt "fork": Kindprozesse erben keine offenen DB-Verbindungen
+    return ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn'),
+                               initializer=django.setup)
+
+
+def _collect(futures, running):
+    """
+    Entfernt abgeschlossene Futures aus running und liefert die IDs der
+    Aufgaben, deren Prozess-Pool dabei abgebrochen ist.
+    """
+    broken = []
+    for future in futures:
+        pk = running.pop(future)
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            broken.append(pk)
+        elif error is not None:
+            logger.error("Worker-Prozess fehlgeschlagen", exc_info=error)
+    return broken
+
+
+def work(processes, poll_interval=1.0, stop=None):
+    """
+    Worker-Schleife: verteilt fällige Aufgaben auf einen Prozess-Pool mit
+    `processes` Prozessen und fragt bei leerer Warteschlange alle
+    poll_interval Sekunden neu ab. Läuft, bis das Event stop gesetzt wird;
+    laufende Aufgaben werden dann noch abgeschlossen.
+
+    Stirbt ein Kindprozess (z. B. OOM-Kill), ist der ganze Pool unbrauchbar:
+    die betroffenen Aufgaben werden freigegeben und der Pool neu gestartet.
+    """
+    stop = stop or threading.Event()
+    pool = _start_pool(processes)
+    running = {}
+    try:
+        while not stop.is_set():
+            broken = []
+            if len(running) < processes:
+                claimed = claim_tasks(processes - len(running))
+                for index, pk in enumerate(claimed):
+                    try:
+                        running[pool.submit(run_task, pk)] = pk
+                    except BrokenProcessPool:
+                        broken.extend(claimed[index:])
+                        break
+            if running and not broken:
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                broken.extend(_collect(done, running))
+            elif not broken:
+                stop.wait(poll_interval)
+                continue
+            if broken:
+                # Alle noch offenen Futures des alten Pools sind ebenfalls abgebrochen
+                broken.extend(_collect(wait(running)[0], running))
+                logger.error("Prozess-Pool abgebrochen, %s Aufgaben werden freigegeben", len(broken))
+                release_tasks(broken, "Worker-Prozess während der Ausführung beendet.")
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _start_pool(processes)
+    finally:
+        pool.shutdown(wait=True)